@@ -0,0 +1,253 @@
+"""
+Headless batch ingestion of resume PDFs.
+
+Parses every PDF in a directory (or listed in a manifest) across a process
+pool and streams one record per resume to JSONL or Parquet. Completed files
+are recorded in a checkpoint so an interrupted run can be resumed.
+
+Usage:
+    python app/batch_ingest.py resumes/ --output parsed.jsonl
+    python app/batch_ingest.py manifest.txt --output parsed.parquet --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from resume_parser import extract_resume, preprocess_resume_text
+from utils import hash_bytes, truncate_partial_line
+
+
+def ingest_file(path):
+    """
+    Parses one resume. Runs in a worker process; never raises.
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        extracted = extract_resume(pdf_bytes)
+        record = {
+            "path": path,
+            "file_name": os.path.basename(path),
+            "hash": hash_bytes(pdf_bytes),
+            "page_count": extracted["page_count"],
+            "raw_text": extracted["text"],
+            "links": extracted["links"],
+            "structured": preprocess_resume_text(extracted["text"], extracted["links"]),
+            "status": "ok",
+            "error": None
+        }
+    except Exception as e:
+        record = {"path": path, "file_name": os.path.basename(path), "status": "error",
+                  "error": f"{type(e).__name__}: {e}"}
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+def list_inputs(source):
+    """
+    Resolves a directory (searched recursively) or a manifest file into PDF paths.
+    Manifests are plain text (one path per line) or JSONL with a "path" field.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "**", "*.pdf"), recursive=True))
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+    return paths
+
+
+class JsonlWriter:
+    def __init__(self, path, append=True):
+        if append and os.path.exists(path):
+            truncate_partial_line(path)  # a crash mid-write leaves a torn last record
+        self.path = path
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def durable_paths(self):
+        """
+        Paths already in the output (a record can land before its checkpoint line).
+        """
+        paths = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                paths.add(json.loads(line)["path"])
+        return paths
+
+    def write(self, record):
+        """
+        Writes a record; returns the paths that are now durably on disk.
+        """
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        return [record["path"]]
+
+    def close(self):
+        self.file.close()
+        return []
+
+
+class ParquetWriter:
+    """
+    Buffers records and writes them as numbered part files inside the output
+    directory, so resumed runs add new parts instead of rewriting old ones.
+    With append=False existing parts are deleted first.
+    """
+
+    def __init__(self, path, rows_per_part=1000, append=True):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow: pip install pyarrow")
+
+        self.directory = path
+        self.rows_per_part = rows_per_part
+        self.buffer = []
+        os.makedirs(path, exist_ok=True)
+        existing = glob.glob(os.path.join(path, "part-*.parquet"))
+        if not append:
+            for part_path in existing:
+                os.remove(part_path)
+            existing = []
+        self.part = len(existing)
+
+    def durable_paths(self):
+        import pyarrow.parquet as pq
+
+        paths = set()
+        for part_path in glob.glob(os.path.join(self.directory, "part-*.parquet")):
+            paths.update(pq.read_table(part_path, columns=["path"]).column("path").to_pylist())
+        return paths
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self.buffer:
+            return []
+        rows = [dict(r, links=json.dumps(r["links"]), structured=json.dumps(r["structured"])) for r in self.buffer]
+        pq.write_table(pa.Table.from_pylist(rows), os.path.join(self.directory, f"part-{self.part:05d}.parquet"))
+        self.part += 1
+        flushed = [r["path"] for r in self.buffer]
+        self.buffer = []
+        return flushed
+
+    def write(self, record):
+        self.buffer.append(record)
+        return self._flush() if len(self.buffer) >= self.rows_per_part else []
+
+    def close(self):
+        return self._flush()
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def run(inputs, output, output_format, checkpoint_path, workers, resume=True):
+    if output_format == "parquet":
+        writer = ParquetWriter(output, append=resume)
+    else:
+        writer = JsonlWriter(output, append=resume)
+
+    done = load_checkpoint(checkpoint_path) | writer.durable_paths() if resume else set()
+    pending = [p for p in inputs if p not in done]
+    print(f"{len(inputs)} files, {len(inputs) - len(pending)} already done, {len(pending)} to process", file=sys.stderr)
+    mode = "a" if resume else "w"  # a fresh run also starts a fresh checkpoint and failure log
+    failures_path = checkpoint_path + ".failures.jsonl"
+    timings, failures = [], 0
+    start = time.perf_counter()
+
+    with open(checkpoint_path, mode, encoding="utf-8") as checkpoint, \
+            open(failures_path, mode, encoding="utf-8") as failures_file, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def record_durable(paths):
+            for path in paths:
+                checkpoint.write(path + "\n")
+            checkpoint.flush()
+
+        # Keep a bounded window of submitted work so huge backfills don't queue everything at once
+        queue = iter(pending)
+        in_flight = set()
+        for path in queue:
+            in_flight.add(executor.submit(ingest_file, path))
+            if len(in_flight) >= workers * 4:
+                break
+
+        processed = 0
+        while in_flight:
+            completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                record = future.result()
+                processed += 1
+                timings.append(record["elapsed_ms"])
+
+                if record["status"] == "ok":
+                    record_durable(writer.write(record))
+                else:
+                    failures += 1
+                    failures_file.write(json.dumps(record) + "\n")
+                    failures_file.flush()
+                    print(f"✗ {record['path']}: {record['error']}", file=sys.stderr)
+
+                if processed % 100 == 0:
+                    rate = processed / (time.perf_counter() - start)
+                    print(f"… {processed}/{len(pending)} ({rate:.1f} files/s)", file=sys.stderr)
+
+                next_path = next(queue, None)
+                if next_path is not None:
+                    in_flight.add(executor.submit(ingest_file, next_path))
+
+        record_durable(writer.close())
+
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    summary = {
+        "processed": len(timings),
+        "succeeded": len(timings) - failures,
+        "failed": failures,
+        "skipped": len(inputs) - len(pending),
+        "wall_seconds": round(elapsed, 2),
+        "files_per_second": round(len(timings) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(timings) / len(timings), 1) if timings else 0.0,
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))] if timings else 0.0,
+        "failures_file": failures_path if failures else None
+    }
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="directory of PDFs or a manifest file")
+    parser.add_argument("--output", required=True, help="output .jsonl file or .parquet directory")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="defaults to the output extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="defaults to <output>.checkpoint")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    output_format = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    checkpoint_path = args.checkpoint or args.output.rstrip("/\\") + ".checkpoint"
+
+    summary = run(list_inputs(args.input), args.output, output_format, checkpoint_path,
+                  args.workers, resume=not args.no_resume)
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import glob
+import json
+import os
+import threading
+import time
+from utils import connect_sqlite
+
+
+class ChatSessionStore:
+    """
+    Indexed, append-only store for saved chat sessions.
+
+    A sessions table holds titles and metadata so the sidebar can list one
+    page of sessions without touching message bodies. Messages are appended
+    one row per turn, and long histories are loaded a page at a time.
+    SQLite (WAL + busy timeout) serialises writes from several app workers.
+    """
+
+    def __init__(self, path="chat_sessions/sessions.sqlite", legacy_dir="chat_sessions"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL UNIQUE,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    message_count INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at);
+                CREATE TABLE IF NOT EXISTS messages (
+                    session_id INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    time TEXT,
+                    PRIMARY KEY (session_id, seq)
+                ) WITHOUT ROWID;
+            """)
+        if legacy_dir:
+            self.import_legacy_json(legacy_dir)
+
+    def import_legacy_json(self, directory):
+        """
+        Imports old one-file-per-chat JSON sessions whose titles aren't stored yet.
+        """
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            title = os.path.splitext(os.path.basename(path))[0]
+            if self.find_session(title) is not None:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    messages = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self.save_session(title, messages, created_at=os.path.getmtime(path))
+
+    def find_session(self, title):
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM sessions WHERE title = ?", (title,)).fetchone()
+        return row[0] if row else None
+
+    def save_session(self, title, messages, created_at=None):
+        """
+        Saves a full history under `title`, replacing any session with that
+        title (as the old JSON "Save Chat" did). Returns the session id.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (title, created_at, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(title) DO UPDATE SET updated_at = excluded.updated_at, message_count = 0",
+                (title, created_at or now, now)
+            )
+            session_id = self._conn.execute("SELECT id FROM sessions WHERE title = ?", (title,)).fetchone()[0]
+            self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, seq, role, content, time) VALUES (?, ?, ?, ?, ?)",
+                [(session_id, seq, m["role"], m["content"], m.get("time")) for seq, m in enumerate(messages)]
+            )
+            self._conn.execute(
+                "UPDATE sessions SET message_count = ? WHERE id = ?", (len(messages), session_id)
+            )
+        return session_id
+
+    def append_message(self, session_id, message):
+        """
+        Appends one turn. The next sequence number is taken inside the insert,
+        so concurrent writers never collide.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO messages (session_id, seq, role, content, time) "
+                "SELECT ?, COALESCE(MAX(seq), -1) + 1, ?, ?, ? FROM messages WHERE session_id = ?",
+                (session_id, message["role"], message["content"], message.get("time"), session_id)
+            )
+            self._conn.execute(
+                "UPDATE sessions SET message_count = message_count + 1, updated_at = ? WHERE id = ?",
+                (time.time(), session_id)
+            )
+
+    def count_sessions(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def list_sessions(self, limit=20, offset=0):
+        """
+        Returns one page of session metadata, most recently updated first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, updated_at, message_count FROM sessions "
+                "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [{"id": r[0], "title": r[1], "updated_at": r[2], "message_count": r[3]} for r in rows]
+
+    def load_messages(self, session_id, limit=50, before_seq=None):
+        """
+        Returns (messages, first_seq): the latest `limit` messages before
+        `before_seq` (or the end), oldest first. first_seq is where the next
+        "load earlier" page should end; 0 means the whole history is loaded.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, role, content, time FROM messages WHERE session_id = ? AND seq < ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, before_seq if before_seq is not None else 2 ** 62, limit)
+            ).fetchall()
+        rows.reverse()
+        messages = [{"role": r[1], "content": r[2], "time": r[3]} for r in rows]
+        return messages, (rows[0][0] if rows else 0)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_chat_store():
+    """
+    Returns the process-wide session store, shared by all browser sessions.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ChatSessionStore()
+    return _store
@@ -1,49 +1,158 @@
 import os  
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
-from vector_store import build_faiss_index, search_index, get_top_k_chunks
-from utils import split_text_into_chunks
+from vector_store import get_retrieval_index, embed_queries
+from utils import split_text_into_chunks, iter_resume_lines, hash_payload, estimate_tokens
+from llm_client import ChatClient, LLMError
+from llm_cache import ResponseCache
+from llm_scheduler import LLMScheduler, PRIORITY_INTERACTIVE, PRIORITY_FEEDBACK, PRIORITY_PROJECTS
 
 # === Groq Configuration ===
-GROQ_API_KEY = st.secrets["GROQ_API_KEY"]  # Set in secrets.toml or Streamlit Cloud
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_API_URL = os.environ.get("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 GROQ_MODEL = "llama-3.1-8b-instant"
+CONTEXT_TOKEN_BUDGET = 600  # resume / JD context tokens sent with a RAG question
+COMPLETION_TOKEN_ESTIMATE = 400  # reserved per call against the tokens-per-minute limit
+LLM_ERROR_MESSAGE = "⚠️ Sorry, something went wrong with the AI response."
+
+_groq_client = None
+_groq_client_lock = threading.Lock()
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_groq_client():
+    """
+    Returns the process-wide pooled client (keep-alive connections, timeouts
+    and retries). Secrets are read on the first LLM call, not at import.
+    """
+    global _groq_client
+    if _groq_client is None:
+        with _groq_client_lock:
+            if _groq_client is None:
+                api_key = st.secrets["GROQ_API_KEY"]  # Set in secrets.toml or Streamlit Cloud
+                _groq_client = ChatClient(GROQ_API_URL, api_key)
+    return _groq_client
+
+
+def get_response_cache():
+    """
+    Returns the process-wide on-disk response cache, opened on first use.
+    LLM_CACHE_SEMANTIC=1 also reuses answers to near-identical questions
+    about the same resume/JD; questions are embedded with embed_queries so
+    they never enter the persistent chunk embedding cache.
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    semantic=os.environ.get("LLM_CACHE_SEMANTIC") == "1",
+                    embed_fn=embed_queries
+                )
+    return _response_cache
+
+
+# Every provider call from every session goes through one scheduler, which
+# keeps the process under the provider's request / token rate limits
+llm_scheduler = LLMScheduler(
+    requests_per_minute=int(os.environ.get("GROQ_RPM_LIMIT", "30")),
+    tokens_per_minute=int(os.environ.get("GROQ_TPM_LIMIT", "6000"))
+)
+
+
+def contains_llm_error(value):
+    """
+    True if a response (or a list / pair of responses) includes the error sentinel.
+    """
+    if isinstance(value, str):
+        return LLM_ERROR_MESSAGE in value
+    if isinstance(value, (list, tuple)):
+        return any(contains_llm_error(item) for item in value)
+    return False
+
+
+def _estimate_call_tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages) + COMPLETION_TOKEN_ESTIMATE
+
 
 # === Groq Chat Caller ===
-def call_groq_chat(messages, model=GROQ_MODEL, temperature=0.7):
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
+def call_groq_chat(messages, model=GROQ_MODEL, temperature=0.7, stream=False, semantic_context=None,
+                   priority=PRIORITY_INTERACTIVE, cancel_event=None, raise_errors=False):
+    """
+    Returns the completion text, or a generator of text deltas when stream=True.
 
-    payload = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature
-    }
+    semantic_context is an optional (context_key, question) pair that lets the
+    response cache answer near-identical questions about the same context.
+    priority is one of the llm_scheduler PRIORITY_* classes; setting
+    cancel_event while the call is queued raises RequestCancelled.
+    Failures are shown with st.error and replaced by LLM_ERROR_MESSAGE;
+    raise_errors=True re-raises the LLMError instead, for callers running
+    outside the Streamlit script thread.
+    """
+    key, cached = get_response_cache().lookup(model, temperature, messages, semantic_context)
+    if cached is not None:
+        return iter([cached]) if stream else cached
 
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload)
+    if stream:
+        return _stream_groq_chat(messages, model, temperature, key, semantic_context, priority, cancel_event,
+                                 raise_errors)
 
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"].strip()
-    else:
-        st.error(f"Groq API Error: {response.status_code} - {response.text}")
-        return "⚠️ Sorry, something went wrong with the AI response."
+    start = time.perf_counter()
+    try:
+        response = llm_scheduler.run(
+            key, lambda: get_groq_client().chat(messages, model=model, temperature=temperature),
+            priority=priority, tokens=_estimate_call_tokens(messages), cancel_event=cancel_event
+        )
+    except LLMError as e:
+        if raise_errors:
+            raise
+        st.error(f"Groq API Error: {e}")
+        return LLM_ERROR_MESSAGE
 
+    get_response_cache().put(key, response, time.perf_counter() - start, model, temperature, semantic_context)
+    return response
 
-# === 1. RAG-style Career Question Answering ===
-def ask_career_question(question, resume_data, jd_skills):
+
+def _stream_groq_chat(messages, model, temperature, key, semantic_context, priority, cancel_event, raise_errors):
+    start = time.perf_counter()
+    parts = []
+    try:
+        for delta in llm_scheduler.stream(
+            key, lambda: get_groq_client().chat_stream(messages, model=model, temperature=temperature),
+            priority=priority, tokens=_estimate_call_tokens(messages), cancel_event=cancel_event
+        ):
+            parts.append(delta)
+            yield delta
+    except LLMError as e:
+        if raise_errors:
+            raise
+        st.error(f"Groq API Error: {e}")
+        yield LLM_ERROR_MESSAGE
+        return
+
+    # Only complete streams are cached
+    get_response_cache().put(key, "".join(parts).strip(), time.perf_counter() - start, model, temperature, semantic_context)
+
+
+# === Shared retrieval context ===
+def get_context_index(resume_data, jd_skills):
+    """
+    Returns the retrieval index over resume + JD, reused until either changes.
+    """
     resume_str = "\n".join([f"{k}: {v}" for k, v in resume_data.items() if v])
     jd_str = ", ".join(jd_skills)
 
-    # Chunk and index resume + JD
     combined_text = resume_str + "\n\nJob Description:\n" + jd_str
-    chunks = split_text_into_chunks(combined_text)
-    index, _ = build_faiss_index(chunks)
+    return get_retrieval_index(split_text_into_chunks(combined_text))
 
-    # Retrieve top matching chunks based on the question
-    top_chunks = search_index(question, index, chunks)
-    context = "\n".join(top_chunks)
+
+# === 1. RAG-style Career Question Answering ===
+def ask_career_question(question, resume_data, jd_skills, stream=False, priority=PRIORITY_INTERACTIVE,
+                        cancel_event=None, raise_errors=False):
+    # Retrieve the best matching chunks, deduplicated and packed into a fixed budget
+    context = get_context_index(resume_data, jd_skills).context(question, CONTEXT_TOKEN_BUDGET)
 
     prompt = f"""
 Use the following context to answer the user's career question:
@@ -59,28 +168,40 @@ User Question:
         {"role": "user", "content": prompt}
     ]
 
-    return call_groq_chat(messages)
+    semantic_context = (hash_payload({"resume": resume_data, "jd": list(jd_skills)}), question)
+    return call_groq_chat(messages, stream=stream, semantic_context=semantic_context, priority=priority,
+                          cancel_event=cancel_event, raise_errors=raise_errors)
 
 
-# === 2. Resume Line Improver ===
-def improve_resume_lines(resume_text, k=3):
-    """
-    Use RAG to improve 2-3 lines from the resume with better phrasing.
-    """
-    chunks = resume_text.split('\n')
-    chunks = [c.strip() for c in chunks if c.strip()]
+def explain_score(resume_skills, jd_skills, stream=False, priority=PRIORITY_FEEDBACK, cancel_event=None,
+                  raise_errors=False):
+    return ask_career_question(
+        "Explain this resume score and how to improve.",
+        {"skills": resume_skills},
+        jd_skills,
+        stream=stream, priority=priority, cancel_event=cancel_event, raise_errors=raise_errors
+    )
 
-    index, all_chunks = build_faiss_index(chunks)
 
-    target_lines = chunks[:3]  # You can enhance this with NLP logic
+def suggest_projects(missing_skills, resume_data, jd_skills, stream=False, priority=PRIORITY_PROJECTS,
+                     cancel_event=None, raise_errors=False):
+    project_prompt = f"""
+The user's resume is missing the following skills: {', '.join(missing_skills)}.
+Suggest 2-3 smart, resume-boosting project ideas that would help them demonstrate these skills.
+Each project should include:
+- a short title
+- 1-2 line description
+- clearly target the missing skills
+"""
+    return ask_career_question(project_prompt, resume_data, jd_skills, stream=stream, priority=priority,
+                               cancel_event=cancel_event, raise_errors=raise_errors)
 
-    improved_lines = []
 
-    for line in target_lines:
-        related_chunks = get_top_k_chunks(index, chunks, line, k=k)
-        context = "\n".join(related_chunks)
+# === 2. Resume Line Improver ===
+def _rewrite_line_messages(line, related_chunks):
+    context = "\n".join(related_chunks)
 
-        prompt = f"""
+    prompt = f"""
 You are a professional resume editor.
 
 Original resume line:
@@ -97,12 +218,64 @@ Rewrite this line to be more impactful using:
 Return only the improved line.
 """
 
-        improved = ask_career_question(prompt, {}, [])
-        improved_lines.append((line, improved))
+    # The prompt already carries its own context; no second index needed
+    return [
+        {"role": "system", "content": "You are a helpful AI career coach."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def iter_improved_resume_lines(resume_text, k=3, num_lines=3, max_workers=4, priority=PRIORITY_FEEDBACK,
+                               cancel_event=None, raise_errors=False):
+    """
+    Rewrites the first `num_lines` resume statements (bullets / sentences)
+    concurrently.
+
+    Retrieval for all target lines is one batched encode + FAISS search; the
+    LLM rewrites then run on a bounded thread pool. Yields
+    (position, original, improved) as each rewrite completes, so callers can
+    render partial results and slot them back into order by position.
+    Errors are reported from the calling thread (see call_groq_chat), never
+    from the pool's workers.
+    """
+    chunks = list(iter_resume_lines(resume_text))
+
+    target_lines = chunks[:num_lines]
+    if not target_lines:
+        return
+
+    related = get_retrieval_index(chunks).search_batch(target_lines, top_k=k)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(target_lines))) as executor:
+        futures = {
+            executor.submit(call_groq_chat, _rewrite_line_messages(line, related_chunks),
+                            priority=priority, cancel_event=cancel_event, raise_errors=True): position
+            for position, (line, related_chunks) in enumerate(zip(target_lines, related))
+        }
+        for future in as_completed(futures):
+            position = futures[future]
+            try:
+                improved = future.result()
+            except LLMError as e:
+                if raise_errors:
+                    raise
+                st.error(f"Groq API Error: {e}")
+                improved = LLM_ERROR_MESSAGE
+            yield position, target_lines[position], improved
+
+
+def improve_resume_lines(resume_text, k=3, num_lines=3, max_workers=4):
+    """
+    Use RAG to improve the first few lines from the resume with better phrasing.
+    Returns (original, improved) pairs in resume order.
+    """
+    improved_lines = [None] * num_lines
+    for position, line, improved in iter_improved_resume_lines(resume_text, k, num_lines, max_workers):
+        improved_lines[position] = (line, improved)
 
-    return improved_lines
+    return [pair for pair in improved_lines if pair is not None]
 
 
 # === 3. Multi-turn Memory Chat ===
-def ask_career_question_multi_turn(chat_history):
-    return call_groq_chat(chat_history)
+def ask_career_question_multi_turn(chat_history, stream=False):
+    return call_groq_chat(chat_history, stream=stream)
@@ -0,0 +1,111 @@
+from utils import estimate_tokens, hash_payload
+
+SYSTEM_PROMPT = "You are a helpful AI career coach. Be clear, concise, and specific."
+
+
+def clip_to_tokens(text, max_tokens, keep="head"):
+    """
+    Trims text to roughly max_tokens, keeping the start ("head") or end ("tail").
+    """
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + " …" if keep == "head" else "… " + text[-max_chars:]
+
+
+def extractive_summary(summary, turns, max_tokens):
+    """
+    Default summarizer: appends a one-line gist of each folded turn and keeps
+    the most recent part of the summary within budget. No extra LLM call.
+    """
+    lines = [summary] if summary else []
+    for turn in turns:
+        speaker = "User asked" if turn["role"] == "user" else "Coach answered"
+        gist = " ".join(turn["content"].split())
+        lines.append(f"- {speaker}: {clip_to_tokens(gist, 40)}")
+    return clip_to_tokens("\n".join(lines), max_tokens, keep="tail")
+
+
+class ChatContextManager:
+    """
+    Builds token-budgeted prompts for the multi-turn sidebar chat.
+
+    The most recent turns are sent verbatim; older turns are folded into a
+    rolling summary; resume/JD context is retrieved per question from the
+    shared FAISS index instead of being sent whole. Prompt size therefore
+    stays flat no matter how long the conversation gets.
+    """
+
+    def __init__(self, token_budget=2500, recent_turns=6, context_tokens=700, summary_tokens=300,
+                 top_k=8, summarizer=None):
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.context_tokens = context_tokens
+        self.summary_tokens = summary_tokens
+        self.top_k = top_k
+        self.summarizer = summarizer or extractive_summary
+
+    def _fold(self, turns, state):
+        """
+        Folds every turn older than the recent window into state["summary"].
+        state also remembers what has been folded so a cleared or reloaded
+        chat starts a fresh summary.
+        """
+        keep_from = max(0, len(turns) - self.recent_turns)
+        folded = state.get("folded", 0)
+        if folded > keep_from or state.get("folded_hash") != hash_payload(turns[:folded]):
+            state["summary"], folded = "", 0
+
+        if keep_from > folded:
+            state["summary"] = self.summarizer(state.get("summary", ""), turns[folded:keep_from], self.summary_tokens)
+            folded = keep_from
+
+        state["folded"] = folded
+        state["folded_hash"] = hash_payload(turns[:folded])
+        return turns[folded:]
+
+    def build_messages(self, history, retrieval_index=None, state=None):
+        """
+        Returns (messages, prompt_tokens) for the next assistant turn.
+
+        Args:
+            history (list): Chat history; system messages are ignored.
+            retrieval_index (RetrievalIndex): Index over resume + JD context.
+            state (dict): Per-session summary state, updated in place.
+        """
+        state = state if state is not None else {}
+        turns = [
+            {"role": m["role"], "content": m["content"]}
+            for m in history if m["role"] in ("user", "assistant")
+        ]
+        recent = self._fold(turns, state)
+
+        system_parts = [SYSTEM_PROMPT]
+
+        question = next((m["content"] for m in reversed(recent) if m["role"] == "user"), "")
+        if retrieval_index is not None and question:
+            context = retrieval_index.context(question, self.context_tokens, candidates=self.top_k)
+            if context:
+                system_parts.append("Relevant resume / job description context:\n" + context)
+
+        if state.get("summary"):
+            system_parts.append("Summary of the earlier conversation:\n" + state["summary"])
+
+        system_message = {"role": "system", "content": "\n\n".join(system_parts)}
+
+        # Drop the oldest verbatim turns if they still don't fit; always keep the last one
+        remaining = self.token_budget - estimate_tokens(system_message["content"])
+        kept = []
+        for message in reversed(recent):
+            cost = estimate_tokens(message["content"])
+            if kept and cost > remaining:
+                break
+            if not kept:
+                message = {"role": message["role"], "content": clip_to_tokens(message["content"], max(remaining - 2, 1))}
+                cost = estimate_tokens(message["content"])
+            kept.append(message)
+            remaining -= cost
+
+        messages = [system_message] + kept[::-1]
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        return messages, prompt_tokens
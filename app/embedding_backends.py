@@ -0,0 +1,191 @@
+"""
+Interchangeable implementations of the sentence-embedding model.
+
+Both backends produce L2-normalised float32 embeddings of the same MiniLM
+model, so vectors from either can be searched the same way:
+
+- "torch": the PyTorch SentenceTransformer (default).
+- "onnx":  the same model exported to ONNX and int8-quantized, run with
+           ONNX Runtime. No PyTorch at serve time, much lower RSS and CPU.
+
+The backend is chosen with EMBEDDING_BACKEND=torch|onnx and the number of
+intra-op threads with EMBEDDING_THREADS (0 = library default).
+
+Usage:
+    python app/embedding_backends.py export     # build the int8 ONNX model once
+"""
+import argparse
+import os
+import threading
+import numpy as np
+
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch")
+EMBEDDING_THREADS = int(os.environ.get("EMBEDDING_THREADS", "0"))
+ONNX_MODEL_DIR = os.path.join("data", "onnx_models")
+MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2 truncates inputs at 256 word pieces
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class TorchBackend:
+    """
+    SentenceTransformer on PyTorch.
+    """
+    name = "torch"
+
+    def __init__(self, model_name, threads=EMBEDDING_THREADS):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=32):
+        vectors = self.model.encode(list(texts), batch_size=batch_size, show_progress_bar=False,
+                                    convert_to_numpy=True)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+class OnnxBackend:
+    """
+    int8-quantized ONNX export of the model on ONNX Runtime.
+
+    Inputs are sorted by length and padded only to the longest text in each
+    batch (dynamic padding), so short queries don't pay for 256-token pads.
+    Token embeddings are mean-pooled over the attention mask and normalised,
+    as the SentenceTransformer pipeline does.
+    """
+    name = "onnx-int8"
+
+    def __init__(self, model_name, threads=EMBEDDING_THREADS, model_dir=None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = model_dir or os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "_"))
+        model_path = os.path.join(model_dir, "model.int8.onnx")
+        if not os.path.exists(model_path):
+            export_onnx_model(model_name, model_dir)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()  # pads to the longest sequence in each batch
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return _normalize(pooled)
+
+    def encode(self, texts, batch_size=32):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        # Batch similar lengths together so each batch pads as little as possible
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            vectors[positions] = self._encode_batch([texts[i] for i in positions])
+        return vectors
+
+
+def export_onnx_model(model_name, model_dir):
+    """
+    One-off export: transformer -> ONNX (dynamic batch and sequence axes) ->
+    int8 dynamic quantization. Needs torch + transformers + onnxruntime,
+    which is why serving hosts can ship the exported files instead.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    os.makedirs(model_dir, exist_ok=True)
+    print(f"⏳ Exporting {hub_name} to ONNX in {model_dir} (one-off)...")
+
+    tokenizer = AutoTokenizer.from_pretrained(hub_name)
+    tokenizer.backend_tokenizer.save(os.path.join(model_dir, "tokenizer.json"))
+    model = AutoModel.from_pretrained(hub_name).eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[name] for name in input_names), fp32_path,
+            input_names=input_names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes, opset_version=17
+        )
+    quantize_dynamic(fp32_path, os.path.join(model_dir, "model.int8.onnx"), weight_type=QuantType.QInt8)
+    print("✅ ONNX export done")
+
+
+BACKENDS = {"torch": TorchBackend, "onnx": OnnxBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_cache_name(model_name, backend=EMBEDDING_BACKEND):
+    """
+    Name under which a backend's embeddings are cached. Quantized vectors are
+    close to, not equal to, the PyTorch ones, so each backend gets its own
+    cache; PyTorch keeps the plain model name so existing caches stay valid.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; expected one of {sorted(BACKENDS)}")
+    return model_name if backend == "torch" else f"{model_name}-{BACKENDS[backend].name}"
+
+
+def get_embedding_backend(model_name):
+    """
+    Returns the process-wide backend selected by EMBEDDING_BACKEND, loading it on first use.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_cache_name(model_name)  # validates EMBEDDING_BACKEND
+                _backend = BACKENDS[EMBEDDING_BACKEND](model_name)
+    return _backend
+
+
+def main():
+    from vector_store import EMBEDDING_MODEL_NAME
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--output", help="defaults to data/onnx_models/<model>")
+    args = parser.parse_args()
+
+    export_onnx_model(args.model, args.output or os.path.join(ONNX_MODEL_DIR, args.model.replace("/", "_")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+EMBEDDING_MAX_BATCH = int(os.environ.get("EMBEDDING_MAX_BATCH", "64"))
+EMBEDDING_MAX_WAIT_MS = float(os.environ.get("EMBEDDING_MAX_WAIT_MS", "5"))
+
+
+class _Request:
+    __slots__ = ("texts", "future", "submitted")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class EmbeddingService:
+    """
+    In-process micro-batcher shared by every session.
+
+    Callers submit texts and get a Future back. One worker thread takes the
+    first queued request, keeps collecting more until `max_batch` texts are
+    queued or `max_wait_ms` has passed, and runs them as a single forward
+    pass. Concurrent users therefore share a few larger batches instead of
+    competing for cores with many one-row passes.
+    """
+
+    def __init__(self, encode_fn, max_batch=EMBEDDING_MAX_BATCH, max_wait_ms=EMBEDDING_MAX_WAIT_MS,
+                 stats_window=2000):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._last_batch_requests = 1
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=stats_window)   # per request, seconds
+        self._completions = deque(maxlen=stats_window)  # (finished_at, n_texts) per batch
+        self._counts = {"requests": 0, "texts": 0, "batches": 0}
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-service", daemon=True)
+                    self._thread.start()
+
+    def submit(self, texts):
+        """
+        Queues texts for encoding; the Future resolves to a (len(texts), dim) array.
+        """
+        request = _Request(list(texts))
+        if not request.texts:
+            request.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts, timeout=None):
+        return self.submit(texts).result(timeout)
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        # With a single caller there is nothing to wait for; the deadline only
+        # applies once concurrent requests have been seen
+        wait = self.max_wait if self._last_batch_requests > 1 or not self._queue.empty() else 0
+        deadline = time.perf_counter() + wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        # Callers that gave up (cancelled their future) are dropped here
+        return [request for request in batch if request.future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            self._last_batch_requests = len(batch)
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = np.asarray(self.encode_fn(texts), dtype=np.float32)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            row = 0
+            for request in batch:
+                request.future.set_result(vectors[row:row + len(request.texts)])
+                row += len(request.texts)
+
+            with self._stats_lock:
+                self._counts["requests"] += len(batch)
+                self._counts["texts"] += len(texts)
+                self._counts["batches"] += 1
+                self._completions.append((finished, len(texts)))
+                self._latencies.extend(finished - request.submitted for request in batch)
+
+    def stats(self):
+        """
+        Totals plus throughput and latency percentiles over the recent window.
+        """
+        with self._stats_lock:
+            counts = dict(self._counts)
+            latencies = sorted(self._latencies)
+            completions = list(self._completions)
+
+        throughput = 0.0
+        if len(completions) > 1:
+            span = completions[-1][0] - completions[0][0]
+            throughput = sum(n for _, n in completions[1:]) / span if span > 0 else 0.0
+
+        def percentile(p):
+            return latencies[int(p * (len(latencies) - 1))] * 1000 if latencies else 0.0
+
+        return {
+            **counts,
+            "queue_depth": self._queue.qsize(),
+            "mean_batch_size": counts["texts"] / counts["batches"] if counts["batches"] else 0.0,
+            "texts_per_second": throughput,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95)
+        }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service():
+    """
+    Returns the process-wide service in front of the embedding backend.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from vector_store import get_embedding_model
+
+                _service = EmbeddingService(lambda texts: get_embedding_model().encode(texts))
+    return _service
@@ -0,0 +1,369 @@
+"""
+Persistent approximate-nearest-neighbour index over stored job descriptions.
+
+Job descriptions are embedded once (mean of their chunk embeddings,
+L2-normalised, so inner product is cosine similarity) and kept in a FAISS
+index on disk next to a SQLite table of job metadata. The index starts out
+exact (flat) and switches to IVF once the corpus is large enough to train
+it; `nprobe` trades recall for latency at query time.
+
+Usage:
+    python app/job_index.py jobs.jsonl          # import {"title", "text"} records
+    python app/job_index.py --rebuild           # retrain IVF for the current corpus
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+import zlib
+import faiss
+import numpy as np
+from utils import connect_sqlite, hash_bytes, split_text_into_chunks
+
+DEFAULT_NPROBE = 16
+TRAIN_THRESHOLD = 10000   # jobs needed before the flat index is replaced by IVF
+REBUILD_GROWTH = 4        # retrain once the corpus is this many times the trained size
+
+
+def embed_documents(texts, encode_fn=None):
+    """
+    Returns one L2-normalised embedding per document: the mean of its chunk
+    embeddings, so long postings aren't truncated to the model's first 256 tokens.
+
+    Chunks are encoded directly (default: the shared embedding service), not
+    through the per-request embedding cache; corpus vectors live only in the
+    FAISS index.
+    """
+    if encode_fn is None:
+        from embedding_service import get_embedding_service
+        encode_fn = get_embedding_service().encode
+
+    doc_chunks = [split_text_into_chunks(text) or [text] for text in texts]
+    vectors = np.asarray(encode_fn([chunk for chunks in doc_chunks for chunk in chunks]), dtype=np.float32)
+
+    documents, row = [], 0
+    for chunks in doc_chunks:
+        documents.append(vectors[row:row + len(chunks)].mean(axis=0))
+        row += len(chunks)
+    return normalize(np.array(documents, dtype=np.float32))
+
+
+def normalize(vectors):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _ivf_nlist(n_vectors):
+    # ~4*sqrt(N) lists, with at least 39 training points per centroid
+    return max(16, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+
+def _all_vectors(index):
+    """
+    Returns (ids, vectors) for everything stored in a flat or IVF index.
+    """
+    if isinstance(index, faiss.IndexIDMap2):
+        ids = faiss.vector_to_array(index.id_map).astype(np.int64)
+        return ids, index.index.reconstruct_n(0, index.ntotal)
+
+    ivf = faiss.extract_index_ivf(index)
+    invlists = ivf.invlists
+    all_ids, all_vectors = [], []
+    for list_no in range(invlists.nlist):
+        size = invlists.list_size(list_no)
+        if not size:
+            continue
+        ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy()
+        codes = faiss.rev_swig_ptr(invlists.get_codes(list_no), size * invlists.code_size).copy()
+        all_ids.append(ids.astype(np.int64))
+        all_vectors.append(codes.view(np.float32).reshape(size, ivf.d))
+    if not all_ids:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, ivf.d), dtype=np.float32)
+    return np.concatenate(all_ids), np.concatenate(all_vectors)
+
+
+class JobIndex:
+    """
+    Corpus of job descriptions searchable by resume.
+
+    Job ids are SQLite row ids and double as FAISS ids, so jobs can be added
+    and removed incrementally. The index file is memory-mapped on load (cheap
+    startup, pages shared between app workers) and only read fully into
+    memory the first time it is modified. Queries re-map it when the file
+    changes, so jobs imported by another process (e.g. the CLI) show up
+    without a restart.
+    """
+
+    def __init__(self, directory="data/job_index", nprobe=DEFAULT_NPROBE, train_threshold=TRAIN_THRESHOLD):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "jobs.faiss")
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(os.path.join(directory, "jobs.sqlite"))
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    hash TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    text BLOB NOT NULL,
+                    added_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+        self._index = None
+        self._mmapped = False
+        self._index_mtime = None
+        self._reload_if_changed()
+
+    # --- metadata helpers ---
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    # --- index lifecycle ---
+    def _file_mtime(self):
+        try:
+            return os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _reload_if_changed(self):
+        # Caller holds self._lock (or is __init__)
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._index_mtime:
+            return
+        self._index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP)
+        self._mmapped = True
+        self._index_mtime = mtime
+
+    def reload(self):
+        """
+        Picks up index changes written by another process (done automatically by queries).
+        """
+        with self._lock:
+            self._reload_if_changed()
+
+    @property
+    def is_trained_ivf(self):
+        return self._index is not None and not isinstance(self._index, faiss.IndexIDMap2)
+
+    def _writable_index(self, dim):
+        if self._index is None:
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        elif self._mmapped:
+            # Memory-mapped indexes are read-only; load a private copy before mutating
+            self._index = faiss.read_index(self.index_path)
+            self._mmapped = False
+        return self._index
+
+    def _build_ivf(self, ids, vectors):
+        nlist = _ivf_nlist(len(vectors))
+        index = faiss.index_factory(vectors.shape[1], f"IVF{nlist},Flat", faiss.METRIC_INNER_PRODUCT)
+        sample = vectors
+        if len(vectors) > nlist * 256:
+            sample = vectors[np.random.default_rng(0).choice(len(vectors), nlist * 256, replace=False)]
+        index.train(sample)
+        index.add_with_ids(vectors, ids)
+        self._set_meta("trained_size", len(vectors))
+        return index
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        faiss.write_index(self._index, tmp_path)
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = self._file_mtime()
+
+    def _maybe_rebuild(self):
+        ntotal = self._index.ntotal
+        if self.is_trained_ivf:
+            if ntotal < REBUILD_GROWTH * self._meta("trained_size", ntotal):
+                return
+        elif ntotal < self.train_threshold:
+            return
+        self._index = self._build_ivf(*_all_vectors(self._index))
+
+    def rebuild(self):
+        """
+        Retrains the IVF coarse quantizer for the current corpus size.
+        """
+        with self._lock, self._conn:
+            self._reload_if_changed()
+            if self._index is None or self._index.ntotal < 16 * 39:
+                return  # too few jobs to train even the smallest IVF; stay exact
+            self._writable_index(self._index.d)
+            self._index = self._build_ivf(*_all_vectors(self._index))
+            self._save()
+
+    # --- mutations ---
+    def add_jobs(self, jobs, vectors=None):
+        """
+        Adds job descriptions ({"title", "text"}) not stored yet.
+
+        `vectors` may carry precomputed normalised embeddings, one per job.
+        Returns the new job ids (duplicates of stored jobs are skipped).
+        """
+        jobs = list(jobs)
+        hashes = [hash_bytes(job["text"].encode("utf-8")) for job in jobs]
+
+        with self._lock, self._conn:
+            known = set()
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT hash FROM jobs WHERE hash IN ({','.join('?' * len(batch))})", batch
+                ))
+
+            new_positions, seen = [], set()
+            for position, content_hash in enumerate(hashes):
+                if content_hash not in known and content_hash not in seen:
+                    new_positions.append(position)
+                    seen.add(content_hash)
+            if not new_positions:
+                return []
+
+            if vectors is None:
+                # Bulk corpus encodes go straight to the backend, not through the
+                # service that batches interactive queries
+                from vector_store import get_embedding_model
+                new_vectors = embed_documents([jobs[p]["text"] for p in new_positions], get_embedding_model().encode)
+            else:
+                new_vectors = normalize(np.asarray(vectors)[new_positions])
+
+            now = time.time()
+            ids = []
+            for position in new_positions:
+                job = jobs[position]
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (hash, title, text, added_at) VALUES (?, ?, ?, ?)",
+                    (hashes[position], job.get("title"), zlib.compress(job["text"].encode("utf-8")), now)
+                )
+                ids.append(cursor.lastrowid)
+
+            self._reload_if_changed()  # build on top of jobs another process added
+            index = self._writable_index(new_vectors.shape[1])
+            index.add_with_ids(new_vectors, np.array(ids, dtype=np.int64))
+            self._maybe_rebuild()
+            self._save()
+        return ids
+
+    def remove_jobs(self, job_ids):
+        """
+        Removes jobs from the index and the metadata table. Returns how many were removed.
+        """
+        job_ids = np.array(list(job_ids), dtype=np.int64)
+        if not len(job_ids):
+            return 0
+        with self._lock, self._conn:
+            self._reload_if_changed()
+            if self._index is None:
+                return 0
+            removed = self._writable_index(self._index.d).remove_ids(job_ids)
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(int(i),) for i in job_ids])
+            self._save()
+        return removed
+
+    # --- queries ---
+    def count(self):
+        with self._lock:
+            self._reload_if_changed()
+            return self._index.ntotal if self._index is not None else 0
+
+    def get_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT title, text FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": job_id, "title": row[0], "text": zlib.decompress(row[1]).decode("utf-8")}
+
+    def search_vectors(self, query_vectors, top_k=10, nprobe=None):
+        """
+        Returns (scores, ids) arrays for normalised query vectors; missing results have id -1.
+        Larger `nprobe` scans more IVF lists: higher recall, higher latency.
+        """
+        query_vectors = normalize(query_vectors)
+        with self._lock:
+            self._reload_if_changed()
+            if self._index is None or self._index.ntotal == 0:
+                empty = np.full((len(query_vectors), top_k), -1, dtype=np.int64)
+                return np.zeros(empty.shape, dtype=np.float32), empty
+
+            params = None
+            if self.is_trained_ivf:
+                params = faiss.SearchParametersIVF(nprobe=nprobe or self.nprobe)
+            return self._index.search(query_vectors, top_k, params=params)
+
+    def search(self, resume_text, top_k=10, nprobe=None):
+        """
+        Returns the top_k stored jobs for a resume, best first, as
+        {"id", "title", "score"} dicts (score is cosine similarity).
+        """
+        scores, ids = self.search_vectors(embed_documents([resume_text]), top_k, nprobe)
+        found = [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+        if not found:
+            return []
+
+        with self._lock:
+            titles = dict(self._conn.execute(
+                f"SELECT id, title FROM jobs WHERE id IN ({','.join('?' * len(found))})", [i for i, _ in found]
+            ).fetchall())
+        return [{"id": i, "title": titles.get(i), "score": s} for i, s in found if i in titles]
+
+
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index():
+    """
+    Returns the process-wide job corpus index, opened on first use.
+    """
+    global _job_index
+    if _job_index is None:
+        with _job_index_lock:
+            if _job_index is None:
+                _job_index = JobIndex()
+    return _job_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", help="JSONL file of {\"title\", \"text\"} job records")
+    parser.add_argument("--directory", default="data/job_index")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rebuild", action="store_true", help="retrain the IVF index after importing")
+    args = parser.parse_args()
+
+    job_index = JobIndex(args.directory)
+    if args.input:
+        added, batch = 0, []
+        with open(args.input, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= args.batch_size:
+                    added += len(job_index.add_jobs(batch))
+                    batch = []
+        added += len(job_index.add_jobs(batch)) if batch else 0
+        print(f"added {added} jobs, corpus size {job_index.count()}", file=sys.stderr)
+    if args.rebuild:
+        job_index.rebuild()
+        print(f"rebuilt index over {job_index.count()} jobs", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
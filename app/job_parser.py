@@ -1,38 +1,83 @@
-import spacy
-from spacy.cli import download
-import re
+import threading
+from skill_matcher import get_skill_matcher
+
+SPACY_MODEL = "en_core_web_sm"
+
+# Keyword extraction only reads POS tags (tok2vec + tagger + attribute_ruler)
+# and noun chunks (parser); NER and the lemmatizer are never loaded.
+SPACY_EXCLUDE = ["ner", "lemmatizer"]
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
 
 def load_spacy_model():
+    """
+    Loads the trimmed spaCy pipeline. Never downloads: if the model package is
+    not installed, returns None and JD parsing falls back to taxonomy matching.
+    """
+    import spacy
+
     try:
-        return spacy.load("en_core_web_sm")
+        return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
     except OSError:
-        download("en_core_web_sm")
-        return spacy.load("en_core_web_sm")
+        print(f"⚠️ spaCy model '{SPACY_MODEL}' is not installed; using skill taxonomy matching only.")
+        return None
 
-nlp = load_spacy_model()
 
-COMMON_SKILLS = [
-    "python", "java", "c++", "sql", "excel", "power bi", "tableau",
-    "tensorflow", "pytorch", "nlp", "opencv", "machine learning",
-    "deep learning", "data analysis", "data science", "html", "css",
-    "javascript", "flask", "django", "aws", "azure", "git"
-]
+def get_nlp():
+    """
+    Returns the process-wide spaCy pipeline, loading it on first use.
+    """
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                _nlp = load_spacy_model()
+                _nlp_loaded = True
+    return _nlp
 
-def extract_keywords_from_jd(jd_text):
-    jd_text = jd_text.lower()
-    doc = nlp(jd_text)
 
-    tokens = [token.text for token in doc if token.pos_ in ["NOUN", "PROPN"]]
-    chunks = [chunk.text.lower() for chunk in doc.noun_chunks]
+def _skills_from_doc(doc, jd_text):
+    matcher = get_skill_matcher()
+    found_skills = set(matcher.extract(jd_text))
+
+    if doc is not None:
+        tokens = [token.text for token in doc if token.pos_ in ["NOUN", "PROPN"]]
+        chunks = [chunk.text.lower() for chunk in doc.noun_chunks]
+        keywords = set(tokens + chunks)
+        found_skills.update({matcher.canonical(keyword) for keyword in keywords} - {None})
 
-    keywords = set(tokens + chunks)
+    return sorted(found_skills)
 
-    found_skills = []
-    for skill in COMMON_SKILLS:
-        if skill.lower() in keywords or re.search(rf"\b{re.escape(skill)}\b", jd_text):
-            found_skills.append(skill.lower())
 
-    return list(set(found_skills))
+def iter_keywords_from_jds(jd_texts, batch_size=64, n_process=1):
+    """
+    Extracts skills from many job descriptions with batched nlp.pipe.
+
+    Args:
+        jd_texts (iterable): Job description texts.
+        batch_size (int): Documents per spaCy batch.
+        n_process (int): spaCy worker processes.
+
+    Yields:
+        list: Skills for each JD, in input order.
+    """
+    texts = (jd_text.lower() for jd_text in jd_texts)
+    nlp = get_nlp()
+
+    if nlp is None:
+        for jd_text in texts:
+            yield _skills_from_doc(None, jd_text)
+        return
+
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield _skills_from_doc(doc, doc.text)
+
+
+def extract_keywords_from_jd(jd_text):
+    return next(iter_keywords_from_jds([jd_text]))
 
 def compare_resume_to_jd(resume_skills, jd_skills):
     resume_set = set([s.lower() for s in resume_skills])
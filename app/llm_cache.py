@@ -0,0 +1,129 @@
+import threading
+import time
+import numpy as np
+from utils import connect_sqlite, hash_payload
+
+
+class ResponseCache:
+    """
+    Persistent cache of LLM completions in front of call_groq_chat.
+
+    Exact mode keys responses by a canonical hash of model, temperature and
+    messages. Semantic mode (optional) also reuses an answer when a new
+    question's embedding is within `semantic_threshold` cosine similarity of a
+    cached question asked against the same resume/JD context. Entries expire
+    after `ttl_seconds` and the least recently used are evicted past
+    `max_entries`.
+    """
+
+    def __init__(self, path="data/llm_cache.sqlite", ttl_seconds=24 * 3600, max_entries=5000,
+                 semantic=False, semantic_threshold=0.92, embed_fn=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic = semantic and embed_fn is not None
+        self.semantic_threshold = semantic_threshold
+        self.embed_fn = embed_fn
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "saved_seconds": 0.0}
+        self._conn = connect_sqlite(path)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    context_key TEXT,
+                    embedding BLOB,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_context ON responses(context_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+
+    @staticmethod
+    def make_key(model, temperature, messages):
+        return hash_payload({
+            "model": model,
+            "temperature": temperature,
+            "messages": [{"role": m["role"], "content": m["content"]} for m in messages]
+        })
+
+    @staticmethod
+    def _scoped_context(model, temperature, context_key):
+        return hash_payload([model, temperature, context_key])
+
+    def _embed(self, question):
+        vector = np.asarray(self.embed_fn([question]), dtype=np.float32)[0]
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _record_hit(self, key, latency, semantic):
+        with self._conn:
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._stats["semantic_hits" if semantic else "hits"] += 1
+        self._stats["saved_seconds"] += latency
+
+    def lookup(self, model, temperature, messages, semantic_context=None):
+        """
+        Returns (key, cached_response_or_None). semantic_context is an optional
+        (context_key, question) pair enabling the semantic hit mode.
+        """
+        key = self.make_key(model, temperature, messages)
+        min_created = time.time() - self.ttl_seconds
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency FROM responses WHERE key = ? AND created_at >= ?",
+                (key, min_created)
+            ).fetchone()
+            if row is not None:
+                self._record_hit(key, row[1], semantic=False)
+                return key, row[0]
+
+        if self.semantic and semantic_context is not None:
+            context_key, question = semantic_context
+            question_vector = self._embed(question)
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, response, latency, embedding FROM responses "
+                    "WHERE context_key = ? AND embedding IS NOT NULL AND created_at >= ?",
+                    (self._scoped_context(model, temperature, context_key), min_created)
+                ).fetchall()
+                if rows:
+                    matrix = np.stack([np.frombuffer(r[3], dtype=np.float32) for r in rows])
+                    similarities = matrix @ question_vector
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.semantic_threshold:
+                        self._record_hit(rows[best][0], rows[best][2], semantic=True)
+                        return key, rows[best][1]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return key, None
+
+    def put(self, key, response, latency, model=None, temperature=None, semantic_context=None):
+        context_key, embedding = None, None
+        if self.semantic and semantic_context is not None:
+            context_key = self._scoped_context(model, temperature, semantic_context[0])
+            embedding = self._embed(semantic_context[1]).tobytes()
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response, latency, context_key, embedding, now, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["semantic_hits"]) / lookups if lookups else 0.0
+        return stats
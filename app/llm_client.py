@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """
+    Raised when a chat completion request fails after all retries.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ChatClient:
+    """
+    Shared HTTP client for OpenAI-compatible chat completion endpoints.
+
+    One requests.Session keeps TLS connections alive across calls (pooled up
+    to `pool_size` per host), every request has connect/read timeouts, and
+    429/5xx responses are retried with jittered exponential backoff that
+    honours the server's Retry-After header.
+    """
+
+    def __init__(self, api_url, api_key, connect_timeout=5.0, read_timeout=60.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=20.0, pool_size=16):
+        self.api_url = api_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        # "Full jitter": spread retries from many callers across the backoff window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def post(self, payload, stream=False):
+        """
+        POSTs a payload, retrying transient failures. Returns the 200 response.
+        """
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if last_attempt:
+                    raise LLMError(f"Request failed: {exc}") from exc
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code == 200:
+                return response
+
+            if response.status_code in RETRYABLE_STATUS_CODES and not last_attempt:
+                delay = self._retry_delay(attempt, response)
+                response.close()
+                time.sleep(delay)
+                continue
+
+            raise LLMError(f"{response.status_code} - {response.text}", status_code=response.status_code)
+
+    def chat(self, messages, model, temperature=0.7):
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature
+        }
+        response = self.post(payload)
+        try:
+            return response.json()["choices"][0]["message"]["content"].strip()
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as exc:
+            # A 200 with a malformed body or an error payload instead of choices
+            raise LLMError(f"Malformed completion response: {response.text[:200]}") from exc
+
+    def chat_stream(self, messages, model, temperature=0.7):
+        """
+        Streams a completion via server-sent events, yielding content deltas
+        as they arrive. Retries only apply before the first byte is received.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        response = self.post(payload, stream=True)
+        response.encoding = "utf-8"  # SSE is UTF-8; requests can't infer it without a charset
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    event = json.loads(data)
+                    choices = event.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                except (ValueError, AttributeError, IndexError) as exc:
+                    raise LLMError(f"Malformed stream event: {data[:200]}") from exc
+                if event.get("error"):
+                    raise LLMError(f"Stream error: {event['error']}")
+                if delta:
+                    yield delta
+        except requests.RequestException as exc:
+            raise LLMError(f"Stream interrupted: {exc}") from exc
+        finally:
+            response.close()
+
+    async def achat(self, messages, model, temperature=0.7):
+        """
+        Async variant of chat() for concurrent callers; runs on the shared pool.
+        """
+        return await asyncio.to_thread(self.chat, messages, model, temperature)
@@ -0,0 +1,235 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from llm_client import LLMError
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = 0   # sidebar chat
+PRIORITY_FEEDBACK = 1      # coach feedback, resume rewrites
+PRIORITY_PROJECTS = 2      # project ideas
+PRIORITY_BACKGROUND = 3    # report content, prefetching
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_FEEDBACK: "feedback",
+    PRIORITY_PROJECTS: "projects",
+    PRIORITY_BACKGROUND: "background"
+}
+
+
+CANCEL_POLL_SECONDS = 0.25  # how often a cancellable waiting call checks its cancel event
+
+
+class SchedulerFull(LLMError):
+    """
+    Raised when too many LLM calls are already waiting for capacity.
+    """
+
+
+class RequestCancelled(Exception):
+    """
+    Raised when a call's cancel event is set while it is still queued.
+    """
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity`, refilled continuously at
+    `capacity` per `period` seconds. Not thread-safe; the scheduler locks it.
+    """
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        Seconds until `amount` is available (0 if it is available now).
+        """
+        self._refill(now)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def consume(self, amount, now):
+        self._refill(now)
+        self.level -= amount
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control in front of the LLM provider.
+
+    Every call first waits for a slot in two token buckets (requests per
+    minute and tokens per minute), so bursts from many sessions are spread
+    out instead of coming back as 429s. Waiting calls are admitted strictly
+    by priority class, then in arrival order. Identical calls that are
+    already in flight (same cache key) share one provider request.
+    """
+
+    def __init__(self, requests_per_minute=30, tokens_per_minute=6000, max_queue=200, stats_window=500):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._waiting = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        self._waits = {priority: deque(maxlen=stats_window) for priority in PRIORITY_NAMES}
+        self._counts = {"admitted": 0, "deduplicated": 0, "rejected": 0, "cancelled": 0}
+
+    # --- admission ---
+    def acquire(self, priority, tokens, cancel_event=None):
+        """
+        Blocks until this call may be sent; returns the seconds spent waiting.
+        Setting `cancel_event` while waiting gives up the place in the queue.
+        """
+        tokens = min(tokens, self.tokens.capacity)  # an oversized prompt must still get through eventually
+        with self._cond:
+            if len(self._waiting) >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise SchedulerFull("Too many AI requests are queued; please try again shortly.", 429)
+
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            enqueued = time.monotonic()
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        self._counts["cancelled"] += 1
+                        raise RequestCancelled()
+                    wait = None  # not at the head of the queue: sleep until the head changes
+                    if self._waiting[0] == ticket:
+                        now = time.monotonic()
+                        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+                        if wait <= 0:
+                            break
+                    if cancel_event is not None:
+                        wait = CANCEL_POLL_SECONDS if wait is None else min(wait, CANCEL_POLL_SECONDS)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            now = time.monotonic()
+            self.requests.consume(1, now)
+            self.tokens.consume(tokens, now)
+            self._counts["admitted"] += 1
+            self._waits[priority].append(now - enqueued)
+            self._cond.notify_all()
+            return now - enqueued
+
+    # --- single-flight ---
+    def _join(self, key, cancel_event):
+        """
+        Returns (future, is_leader). Only the leader makes the provider call;
+        followers get its future. A follower whose leader was cancelled while
+        queued takes over instead of inheriting the cancellation.
+        """
+        while True:
+            with self._inflight_lock:
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    return future, True
+                self._counts["deduplicated"] += 1
+            try:
+                future.result()
+                return future, False
+            except RequestCancelled:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise
+            except BaseException:
+                return future, False
+
+    def _finish(self, key, future, result=None, error=None):
+        # Unregister before resolving, so a retrying follower never rejoins a finished call
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run(self, key, call, priority=PRIORITY_INTERACTIVE, tokens=1, cancel_event=None):
+        """
+        Runs call() once admitted and returns its result. Concurrent runs with
+        the same key wait for the first one instead of calling again.
+        """
+        future, is_leader = self._join(key, cancel_event)
+        if not is_leader:
+            return future.result()
+        try:
+            self.acquire(priority, tokens, cancel_event)
+            result = call()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stream(self, key, stream_call, priority=PRIORITY_INTERACTIVE, tokens=1, cancel_event=None):
+        """
+        Generator version of run() for streamed completions. The leader yields
+        deltas as they arrive; duplicates receive the full text once it is done.
+        """
+        future, is_leader = self._join(key, cancel_event)
+        if not is_leader:
+            yield future.result()
+            return
+        parts = []
+        try:
+            self.acquire(priority, tokens, cancel_event)
+            for delta in stream_call():
+                parts.append(delta)
+                yield delta
+        except GeneratorExit:
+            # The leader's reader went away mid-stream; don't hand duplicates a truncated answer
+            self._finish(key, future, error=LLMError("The shared request was cancelled before it finished."))
+            raise
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, "".join(parts))
+
+    # --- metrics ---
+    def stats(self):
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                queued[PRIORITY_NAMES[priority]] += 1
+            waits = {priority: sorted(samples) for priority, samples in self._waits.items()}
+            counts = dict(self._counts)
+            now = time.monotonic()
+            self.requests.wait_time(0, now)  # refill before reading the levels
+            self.tokens.wait_time(0, now)
+            requests_left, tokens_left = self.requests.level, self.tokens.level
+
+        def percentile(samples, p):
+            return samples[int(p * (len(samples) - 1))] if samples else 0.0
+
+        return {
+            **counts,
+            "queue_depth": sum(queued.values()),
+            "queued_by_priority": queued,
+            "in_flight": len(self._inflight),
+            "wait_p50_s": {PRIORITY_NAMES[p]: percentile(s, 0.50) for p, s in waits.items()},
+            "wait_p95_s": {PRIORITY_NAMES[p]: percentile(s, 0.95) for p, s in waits.items()},
+            "requests_available": requests_left,
+            "tokens_available": tokens_left
+        }
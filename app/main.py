@@ -1,12 +1,20 @@
 import streamlit as st
 import os
-import json
-import tempfile
-from resume_parser import extract_text_from_pdf, extract_links_from_pdf, preprocess_resume_text
+from resume_parser import parse_resume_bytes
 from job_parser import extract_keywords_from_jd, compare_resume_to_jd
-from chatbot import ask_career_question, improve_resume_lines, ask_career_question_multi_turn
-from scoring import calculate_resume_score
-from report_exporter import export_career_report
+from chatbot import explain_score, suggest_projects, iter_improved_resume_lines, ask_career_question_multi_turn, get_response_cache, get_context_index, llm_scheduler, contains_llm_error
+from llm_scheduler import PRIORITY_BACKGROUND
+from prefetch import Prefetcher, PREFETCH_AI_ACTIONS
+from context_manager import ChatContextManager
+from warmup import start_background_warm_up
+from chat_store import get_chat_store
+from scoring import calculate_resume_score, calculate_semantic_resume_score
+from ranking import rank_resumes
+from report_exporter import get_career_report, report_timestamp
+from pipeline import StagePipeline
+from job_index import get_job_index, DEFAULT_NPROBE
+from embedding_service import get_embedding_service
+from utils import hash_bytes, hash_payload
 import warnings
 from datetime import datetime
 
@@ -26,19 +34,52 @@ defaults = {
     "score_data": {},
     "explanation": "",
     "project_list": [],
-    "improved_lines": []
+    "improved_lines": [],
+    # Settings whose widgets are only rendered in some reruns (see persistent_widget_key)
+    "semantic_scoring": False,
+    "rewrite_num_lines": 3
 }
 
 for key, value in defaults.items():
     if key not in st.session_state:
         st.session_state[key] = value
 
+
+def persistent_widget_key(key):
+    """
+    Streamlit drops a widget's key from session_state on any rerun where the
+    widget isn't rendered. The setting lives under `key`; the widget gets its
+    own key, re-seeded from it, and writes back via save_widget_value.
+    """
+    widget_key = f"_{key}"
+    st.session_state[widget_key] = st.session_state[key]
+    return widget_key
+
+
+def save_widget_value(key):
+    st.session_state[key] = st.session_state[f"_{key}"]
+
+
 # ------------------ CHAT MEMORY ------------------
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = [
         {"role": "system", "content": "You are a helpful AI career coach. Be clear, concise, and specific."}
     ]
 
+# ------------------ STAGE PIPELINE ------------------
+# Each stage is memoized on a hash of its inputs, so a rerun (e.g. typing in
+# the chat box) only recomputes the stages whose inputs actually changed
+if "pipeline" not in st.session_state:
+    st.session_state.pipeline = StagePipeline()
+pipeline = st.session_state.pipeline
+pipeline.begin_rerun()
+
+
+def llm_succeeded(value):
+    # Failed AI responses are shown once but not memoized, so the next click retries
+    return not contains_llm_error(value)
+
+
 # ------------------ RESUME UPLOAD ------------------
 st.title("📄 Upload Your Resume")
 st.write("Let the AI Career Coach read your resume and extract key details!")
@@ -46,30 +87,24 @@ st.write("Let the AI Career Coach read your resume and extract key details!")
 uploaded_file = st.file_uploader("Choose your resume (PDF)", type="pdf")
 
 resume_skills, raw_text, structured_info = [], "", {}
+base_name = "resume"
 
 if uploaded_file is not None:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-        temp_file.write(uploaded_file.read())
-        temp_path = temp_file.name
-
     st.info("🔍 Extracting information...")
-    raw_text = extract_text_from_pdf(temp_path)
-    links = extract_links_from_pdf(temp_path)
-    structured_info = preprocess_resume_text(raw_text, links)
-    resume_skills = structured_info.get("skills", [])
+    pdf_bytes = uploaded_file.getvalue()
+    parsed, _ = pipeline.run(
+        "parse", lambda: parse_resume_bytes(pdf_bytes, file_name=uploaded_file.name), hash_bytes(pdf_bytes)
+    )
+    raw_text = parsed["raw_text"]
+    structured_info = parsed["structured"]
+    resume_skills, _ = pipeline.run("skills", lambda: structured_info.get("skills", []), parsed["hash"])
 
     st.subheader("✅ Extracted Resume Summary")
     for key, value in structured_info.items():
         st.markdown(f"**{key.capitalize()}**: {value if value else '❌ Not found'}")
 
     base_name = os.path.splitext(uploaded_file.name)[0]
-    output_dir = "data/parsed_resumes"
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f"{base_name}_structured.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(structured_info, f, indent=2)
-
-    st.success(f"📁 Structured resume saved to `{output_path}`")
+    st.success(f"📁 Structured resume stored (id `{parsed['hash'][:12]}`)")
 
 # ------------------ JOB DESCRIPTION INPUT ------------------
 st.subheader("📥 Paste a Job Description")
@@ -77,12 +112,18 @@ jd_input = st.text_area("Paste the job description here:")
 
 if jd_input and uploaded_file:
     if st.button("🔍 Extract JD Skills"):
-        st.session_state.jd_skills = extract_keywords_from_jd(jd_input)
+        st.session_state.jd_skills, _ = pipeline.run(
+            "jd_extraction", lambda: extract_keywords_from_jd(jd_input), jd_input
+        )
         st.success("✅ JD Skills Extracted")
         st.write(st.session_state.jd_skills)
 
     if resume_skills:
-        comparison = compare_resume_to_jd(resume_skills, st.session_state.jd_skills)
+        comparison, _ = pipeline.run(
+            "comparison",
+            lambda: compare_resume_to_jd(resume_skills, st.session_state.jd_skills),
+            resume_skills, st.session_state.jd_skills
+        )
         
         st.subheader("📊 Resume ↔ JD Skill Matching")
         st.markdown(f"✅ **Matched Skills:** {', '.join(comparison['matched_skills']) or 'None'}")
@@ -96,6 +137,82 @@ if jd_input and uploaded_file:
 
 jd_skills = st.session_state.jd_skills
 
+# ------------------ MULTI-RESUME RANKING ------------------
+with st.expander("🏆 Rank Multiple Resumes Against This JD"):
+    ranking_files = st.file_uploader(
+        "Upload candidate resumes (PDF)", type="pdf", accept_multiple_files=True, key="ranking_uploads"
+    )
+    if ranking_files and not jd_skills:
+        st.info("Extract JD skills first to rank candidates.")
+    elif ranking_files:
+        top_k = len(ranking_files)
+        if len(ranking_files) > 1:  # a slider needs min_value < max_value
+            top_k = st.slider("Show top candidates", 1, len(ranking_files), min(10, len(ranking_files)))
+        # Each upload is parsed once per session (so a rerun is not a repeat upload)
+        # and the ranking is memoized on the set of file hashes
+        parsed_skills = st.session_state.setdefault("ranking_skills", {})
+        hashes = []
+        for f in ranking_files:
+            pdf_bytes = f.getvalue()
+            content_hash = hash_bytes(pdf_bytes)
+            if content_hash not in parsed_skills:
+                parsed = parse_resume_bytes(pdf_bytes, file_name=f.name)
+                parsed_skills[content_hash] = parsed["structured"].get("skills", [])
+            hashes.append(content_hash)
+        for content_hash in set(parsed_skills) - set(hashes):
+            del parsed_skills[content_hash]
+
+        names = [f.name for f in ranking_files]
+        ranking, _ = pipeline.run(
+            "ranking", lambda: rank_resumes([parsed_skills[h] for h in hashes], [jd_skills], resume_ids=names),
+            hashes, names, jd_skills
+        )
+        st.dataframe([
+            {
+                "Resume": row["resume"],
+                "Score": row["score"],
+                "Fit Level": row["fit_level"],
+                "Missing Skills": ", ".join(row["missing"]) or "None"
+            }
+            for row in ranking.top_k(top_k)[0]
+        ])
+
+
+# ------------------ JOB CORPUS SEARCH ------------------
+if raw_text:
+    with st.expander("🔎 Best Matching Jobs From the Corpus"):
+        job_index = get_job_index()
+        if not job_index.count():
+            st.info("No jobs indexed yet. Import some with `python app/job_index.py jobs.jsonl`.")
+        else:
+            nprobe = st.select_slider(
+                "Search depth (higher is more accurate but slower)",
+                options=[1, 4, 8, 16, 32, 64, 128], value=DEFAULT_NPROBE
+            )
+            job_matches, _ = pipeline.run(
+                "job_matches", lambda: job_index.search(raw_text, top_k=10, nprobe=nprobe),
+                raw_text, nprobe, job_index.count()
+            )
+            st.dataframe([{"Job": m["title"], "Similarity": round(m["score"], 3)} for m in job_matches])
+
+
+def compute_score(semantic):
+    scorer = calculate_semantic_resume_score if semantic else calculate_resume_score
+    score_data, _ = pipeline.run("score", lambda: scorer(resume_skills, jd_skills), resume_skills, jd_skills, semantic)
+    return score_data
+
+
+def show_improved_line(slot, original, improved_line):
+    slot.markdown(f"""
+**📌 Original:**  
+> {original}
+
+**✅ Improved:**  
+> {improved_line}
+---
+""")
+
+
 # ------------------ INDEPENDENT BUTTONS ------------------
 st.subheader("📌 AI Actions")
 
@@ -129,10 +246,68 @@ with col4:
         st.session_state.feedback_requested = False
         st.session_state.score_requested = False
 
+# ------------------ SPECULATIVE PREFETCH ------------------
+# Opt-in: once the resume and JD skills are known, feedback, project ideas and
+# rewrites start in the background at the lowest LLM priority, so a later click
+# is instant. Work for inputs that have since changed is cancelled.
+if "prefetcher" not in st.session_state:
+    st.session_state.prefetcher = Prefetcher()
+prefetcher = st.session_state.prefetcher
+
+prefetch_enabled = st.checkbox("⚡ Prefetch AI actions in the background", value=PREFETCH_AI_ACTIONS,
+                               key="prefetch_enabled")
+rewrite_num_lines = st.session_state.rewrite_num_lines
+feedback_key = hash_payload(["feedback", resume_skills, jd_skills])
+rewrites_key = hash_payload(["rewrites", raw_text, rewrite_num_lines])
+
+
+def projects_key(missing_skills):
+    return hash_payload(["projects", structured_info, jd_skills, missing_skills])
+
+
+# Prefetch jobs run off the script thread: LLM errors are raised (the job
+# fails and the click retries live) instead of being shown with st.error
+def prefetch_rewrites(cancel_event, resume_text=raw_text, num_lines=rewrite_num_lines):
+    improved_lines = [None] * num_lines
+    for position, original, improved_line in iter_improved_resume_lines(
+            resume_text, num_lines=num_lines, priority=PRIORITY_BACKGROUND, cancel_event=cancel_event,
+            raise_errors=True):
+        improved_lines[position] = (original, improved_line)
+    return [pair for pair in improved_lines if pair is not None]
+
+
+if prefetch_enabled and resume_skills and jd_skills:
+    # Project ideas are prefetched for the missing skills of the score the click
+    # will use (exact or semantic), so the keys match
+    prefetch_missing = compute_score(st.session_state.semantic_scoring)["missing"]
+    prefetch_jobs = {
+        "feedback": (feedback_key, lambda cancel_event, skills=resume_skills, jd=jd_skills: explain_score(
+            skills, jd, priority=PRIORITY_BACKGROUND, cancel_event=cancel_event, raise_errors=True
+        )),
+        "rewrites": (rewrites_key, prefetch_rewrites)
+    }
+    if prefetch_missing:
+        prefetch_jobs["projects"] = (
+            projects_key(prefetch_missing),
+            lambda cancel_event, missing=prefetch_missing, resume=structured_info, jd=jd_skills: suggest_projects(
+                missing, resume, jd, priority=PRIORITY_BACKGROUND, cancel_event=cancel_event, raise_errors=True
+            )
+        )
+    prefetcher.update(prefetch_jobs)
+    prefetch_status = prefetcher.status()
+    if prefetch_status:
+        st.caption("Prefetch: " + " · ".join(f"{action} {state}" for action, state in prefetch_status.items()))
+else:
+    prefetcher.cancel_all()
+
 # ------------------ EXECUTION BLOCKS ------------------
 
 if st.session_state.score_requested and resume_skills and jd_skills:
-    st.session_state.score_data = calculate_resume_score(resume_skills, jd_skills)
+    semantic_scoring = st.checkbox(
+        "🔎 Semantic skill matching (partial credit for related skills)",
+        key=persistent_widget_key("semantic_scoring"), on_change=save_widget_value, args=("semantic_scoring",)
+    )
+    st.session_state.score_data = compute_score(semantic_scoring)
     score_data = st.session_state.score_data
 
     st.subheader("📈 Resume Fit Score")
@@ -143,87 +318,151 @@ if st.session_state.score_requested and resume_skills and jd_skills:
 ✅ **Matched Skills:** {', '.join(score_data['matched']) or 'None'}  
 ❌ **Missing Skills:** {', '.join(score_data['missing']) or 'None'}  
 """)
+    if score_data.get("partial"):
+        st.markdown("🟡 **Related Skills (partial credit):** " + ", ".join(
+            f"{p['skill']} ≈ {p['match']} ({p['similarity']:.2f})" for p in score_data["partial"]
+        ))
 
 if st.session_state.feedback_requested and resume_skills and jd_skills:
     st.subheader("🧠 AI Coach Feedback")
+    def run_feedback():
+        prefetched = prefetcher.take("feedback", feedback_key)
+        if prefetched is not None:
+            st.write(prefetched)
+            return prefetched
+        # Stream tokens as they arrive; write_stream returns the full text
+        return st.write_stream(explain_score(resume_skills, jd_skills, stream=True))
+
     with st.spinner("Thinking..."):
-        st.session_state.explanation = ask_career_question(
-            "Explain this resume score and how to improve.",
-            {"skills": resume_skills},
-            jd_skills
+        explanation, computed = pipeline.run(
+            "feedback", run_feedback, resume_skills, jd_skills, keep=llm_succeeded
         )
-        st.write(st.session_state.explanation)
+    if not computed:
+        st.write(explanation)
+    st.session_state.explanation = explanation
 
 if st.session_state.project_requested and resume_skills and jd_skills:
     st.subheader("💡 AI Suggested Projects")
-    score_data = st.session_state.score_data or calculate_resume_score(resume_skills, jd_skills)
+    score_data = compute_score(st.session_state.semantic_scoring)
     st.session_state.score_data = score_data
 
     if score_data["missing"]:
+        def run_projects():
+            prefetched = prefetcher.take("projects", projects_key(score_data["missing"]))
+            if prefetched is not None:
+                st.write(prefetched)
+                return prefetched
+            return st.write_stream(suggest_projects(score_data["missing"], structured_info, jd_skills, stream=True))
+
         with st.spinner("Thinking of projects just for you..."):
-            project_prompt = f"""
-The user's resume is missing the following skills: {', '.join(score_data['missing'])}.
-Suggest 2-3 smart, resume-boosting project ideas that would help them demonstrate these skills.
-Each project should include:
-- a short title
-- 1-2 line description
-- clearly target the missing skills
-"""
-            project_ideas = ask_career_question(project_prompt, structured_info, jd_skills)
+            project_ideas, computed = pipeline.run(
+                "projects", run_projects, structured_info, jd_skills, score_data["missing"], keep=llm_succeeded
+            )
+        if not computed:
             st.write(project_ideas)
-            st.session_state.project_list = [line.strip("\n ") for line in project_ideas.splitlines() if line.strip()]
+        st.session_state.project_list = [line.strip("\n ") for line in project_ideas.splitlines() if line.strip()]
     else:
         st.success("✅ No missing skills! Your resume already covers all required areas.")
 
 if st.session_state.rewrite_requested and raw_text:
     st.subheader("✍️ Resume Improvement Suggestions")
-    with st.spinner("Analyzing your resume..."):
-        st.session_state.improved_lines = improve_resume_lines(raw_text)
-        for original, improved_line in st.session_state.improved_lines:
-            st.markdown(f"""
-**📌 Original:**  
-> {original}
+    num_lines = st.number_input(
+        "Lines to improve", min_value=1, max_value=20,
+        key=persistent_widget_key("rewrite_num_lines"), on_change=save_widget_value, args=("rewrite_num_lines",)
+    )
 
-**✅ Improved:**  
-> {improved_line}
----
-""")
+    def rewrite_lines():
+        prefetched = prefetcher.take("rewrites", hash_payload(["rewrites", raw_text, num_lines]))
+        if prefetched is not None:
+            for original, improved_line in prefetched:
+                show_improved_line(st.empty(), original, improved_line)
+            return prefetched
+        # Rewrites run concurrently; each slot is filled as soon as its line is ready
+        slots = [st.empty() for _ in range(num_lines)]
+        improved_lines = [None] * num_lines
+        for position, original, improved_line in iter_improved_resume_lines(raw_text, num_lines=num_lines):
+            improved_lines[position] = (original, improved_line)
+            show_improved_line(slots[position], original, improved_line)
+        return [pair for pair in improved_lines if pair is not None]
+
+    with st.spinner("Analyzing your resume..."):
+        improved_lines, computed = pipeline.run(
+            "rewrites", rewrite_lines, raw_text, num_lines, keep=llm_succeeded
+        )
+    if not computed:
+        for original, improved_line in improved_lines:
+            show_improved_line(st.empty(), original, improved_line)
+    st.session_state.improved_lines = improved_lines
 
 # ------------------ CHATBOT ------------------
 from datetime import datetime
 
+chat_store = get_chat_store()
+CHAT_PAGE_SIZE = 50       # messages loaded per page of a saved chat
+SESSION_LIST_PAGE = 20    # saved chats listed per page in the sidebar
+
+
+def record_chat_message(message):
+    st.session_state.chat_history.append(message)
+    # Once a chat has been saved, every new turn is appended to it
+    if st.session_state.get("chat_session_id") is not None:
+        chat_store.append_message(st.session_state.chat_session_id, message)
+
+
+def load_earlier_messages():
+    older, first_seq = chat_store.load_messages(
+        st.session_state.chat_session_id, limit=CHAT_PAGE_SIZE, before_seq=st.session_state.chat_first_seq
+    )
+    st.session_state.chat_history = older + st.session_state.chat_history
+    st.session_state.chat_first_seq = first_seq
+
+
+def load_selected_chat(titles):
+    session_id = st.session_state.saved_chat_choice
+    if session_id is None:
+        return
+    messages, first_seq = chat_store.load_messages(session_id, limit=CHAT_PAGE_SIZE)
+    st.session_state.chat_history = messages
+    st.session_state.chat_first_seq = first_seq
+    st.session_state.chat_session_id = session_id
+    st.session_state.pop("chat_context_state", None)
+    st.session_state.loaded_chat_notice = titles.get(session_id, session_id)
+
+
 def handle_user_message():
     user_input = st.session_state.user_input
     if not user_input.strip():
         return
 
     now = datetime.now().strftime("%H:%M")
-    st.session_state.chat_history.append({
+    record_chat_message({
         "role": "user",
         "content": user_input,
         "time": now
     })
 
-    # Provide resume + JD context ONLY to the LLM, NOT as visible chat messages
-    resume_context = "\n".join([f"{k}: {v}" for k, v in structured_info.items()])
-    jd_context = ", ".join(st.session_state.jd_skills) if st.session_state.jd_skills else "N/A"
+    # The reply is streamed into the sidebar further down the script run
+    st.session_state.pending_reply = True
+    st.session_state.user_input = ""
 
-    prompt_context = [
-        {"role": "system", "content": "You are a helpful AI career coach."},
-        {"role": "user", "content": f"Resume:\n{resume_context}\n\nJD Keywords:\n{jd_context}"}
-    ] + [
-        {"role": m["role"], "content": m["content"]} for m in st.session_state.chat_history
-    ]
 
-    response = ask_career_question_multi_turn(prompt_context)
+chat_context_manager = ChatContextManager()
 
-    st.session_state.chat_history.append({
-        "role": "assistant",
-        "content": response,
-        "time": now
-    })
 
-    st.session_state.user_input = ""
+def build_chat_prompt():
+    # Resume + JD context is retrieved per question and sent ONLY to the LLM,
+    # NOT as visible chat messages; older turns are folded into a summary
+    if "chat_context_state" not in st.session_state:
+        st.session_state.chat_context_state = {}
+        st.session_state.prompt_token_log = []
+
+    messages, prompt_tokens = chat_context_manager.build_messages(
+        st.session_state.chat_history,
+        retrieval_index=get_context_index(structured_info, st.session_state.jd_skills),
+        state=st.session_state.chat_context_state
+    )
+    st.session_state.prompt_token_log.append(prompt_tokens)
+    return messages
 
 
 # ---------- CHAT SIDEBAR ----------
@@ -234,15 +473,41 @@ if st.sidebar.button("🧹 Clear Chat"):
     st.session_state.chat_history = [
         {"role": "system", "content": "You are a helpful AI career coach."}
     ]
+    st.session_state.chat_session_id = None
+    st.session_state.chat_first_seq = 0
+    # Deselect the loaded chat too (so selecting it again reloads it) and drop
+    # its rolling summary so nothing carries over
+    st.session_state.saved_chat_choice = None
+    st.session_state.pop("chat_context_state", None)
+
+# Long saved chats are loaded a page at a time
+if st.session_state.get("chat_first_seq"):
+    st.sidebar.button("⬆️ Load earlier messages", on_click=load_earlier_messages)
 
 # Show chat history (skip system prompt)
-for msg in st.session_state.chat_history[1:]:
+for msg in st.session_state.chat_history:
+    if msg["role"] == "system":
+        continue
     role = "🧑 You" if msg["role"] == "user" else "🤖 Coach"
     time = msg.get("time", "--:--")
     st.sidebar.markdown(f"**{role}** [{time}]")
     st.sidebar.markdown(f"> {msg['content']}")
     st.sidebar.markdown("---")
 
+# Stream the coach's reply to the latest message as it is generated
+if st.session_state.get("pending_reply"):
+    st.session_state.pending_reply = False
+    st.sidebar.markdown(f"**🤖 Coach** [{datetime.now().strftime('%H:%M')}]")
+    with st.sidebar:
+        response = st.write_stream(ask_career_question_multi_turn(build_chat_prompt(), stream=True))
+    st.sidebar.markdown("---")
+
+    record_chat_message({
+        "role": "assistant",
+        "content": response,
+        "time": datetime.now().strftime("%H:%M")
+    })
+
 # Chat input
 st.sidebar.text_input(
     "Ask a question...",
@@ -254,51 +519,106 @@ with st.sidebar.expander("💾 Save Chat"):
     chat_name = st.text_input("Chat title:")
     if st.button("Save Chat"):
         if chat_name:
-            path = f"chat_sessions/{chat_name}.json"
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(st.session_state.chat_history, f, indent=2)
-            st.success(f"✅ Saved as `{chat_name}.json`")
-
-saved_chats = [f.replace(".json", "") for f in os.listdir("chat_sessions") if f.endswith(".json")]
+            while st.session_state.get("chat_first_seq"):
+                load_earlier_messages()
+            st.session_state.chat_session_id = chat_store.save_session(chat_name, st.session_state.chat_history)
+            st.success(f"✅ Saved as `{chat_name}` — new messages are saved automatically")
 
 with st.sidebar.expander("📂 Load Previous Chat"):
-    selected_chat = st.selectbox("Choose a chat", ["-- Select --"] + saved_chats)
-
-    if selected_chat != "-- Select --":
-        with open(f"chat_sessions/{selected_chat}.json", "r", encoding="utf-8") as f:
-            st.session_state.chat_history = json.load(f)
-        st.success(f"✅ Loaded `{selected_chat}`")
-
+    # Only one page of titles is read from the session index per rerun
+    total_sessions = chat_store.count_sessions()
+    page_count = max(1, -(-total_sessions // SESSION_LIST_PAGE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1) if page_count > 1 else 1
+    sessions = chat_store.list_sessions(limit=SESSION_LIST_PAGE, offset=(page - 1) * SESSION_LIST_PAGE)
+    titles = {s["id"]: f"{s['title']} ({s['message_count']} msgs)" for s in sessions}
+
+    # Loading happens only when the selection itself changes, never on a plain rerun
+    st.selectbox("Choose a chat", [None] + list(titles), key="saved_chat_choice",
+                 on_change=load_selected_chat, args=(titles,),
+                 format_func=lambda session_id: titles.get(session_id, "-- Select --"))
+
+    loaded_title = st.session_state.pop("loaded_chat_notice", None)
+    if loaded_title:
+        st.success(f"✅ Loaded `{loaded_title}`")
+
+
+if st.session_state.get("prompt_token_log"):
+    with st.sidebar.expander("📏 Prompt Size per Turn"):
+        st.caption(f"Last prompt: ~{st.session_state.prompt_token_log[-1]} tokens "
+                   f"(budget {chat_context_manager.token_budget})")
+        st.line_chart(st.session_state.prompt_token_log)
+
+with st.sidebar.expander("⚙️ LLM Cache"):
+    cache_stats = get_response_cache().stats()
+    st.markdown(f"""
+**Hit rate:** {cache_stats['hit_rate']:.0%}  
+**Exact hits:** {cache_stats['hits']} · **Semantic hits:** {cache_stats['semantic_hits']} · **Misses:** {cache_stats['misses']}  
+**Latency saved:** {cache_stats['saved_seconds']:.1f}s
+""")
 
+with st.sidebar.expander("🚦 LLM Scheduler"):
+    scheduler_stats = llm_scheduler.stats()
+    st.markdown(f"""
+**Queued:** {scheduler_stats['queue_depth']} · **In flight:** {scheduler_stats['in_flight']} · **Merged duplicates:** {scheduler_stats['deduplicated']}  
+**Capacity left:** {scheduler_stats['requests_available']:.0f} requests · {scheduler_stats['tokens_available']:.0f} tokens
+""")
+    st.dataframe([
+        {
+            "Priority": name,
+            "Queued": scheduler_stats["queued_by_priority"][name],
+            "Wait p50 (s)": round(scheduler_stats["wait_p50_s"][name], 2),
+            "Wait p95 (s)": round(scheduler_stats["wait_p95_s"][name], 2)
+        }
+        for name in scheduler_stats["queued_by_priority"]
+    ])
+
+with st.sidebar.expander("🧮 Embedding Service"):
+    service_stats = get_embedding_service().stats()
+    st.markdown(f"""
+**Throughput:** {service_stats['texts_per_second']:.1f} texts/s · **Mean batch:** {service_stats['mean_batch_size']:.1f}  
+**Latency:** p50 {service_stats['p50_ms']:.1f} ms · p95 {service_stats['p95_ms']:.1f} ms · **Queued:** {service_stats['queue_depth']}
+""")
 
 
 # ------------------ REPORT EXPORT ------------------
 st.subheader("📥 Download Career Report")
 
 if st.button("📄 Generate PDF Report"):
-    score_data = st.session_state.get("score_data", {
+    score_data = st.session_state.get("score_data") or {
         "score": 0,
         "fit_level": "Not generated",
         "matched": [],
         "missing": []
-    })
+    }
     explanation = st.session_state.get("explanation", "No feedback generated.")
     project_list = st.session_state.get("project_list", [])
 
     filename = f"career_report_{base_name}.pdf"
-    export_career_report(
-        filename=filename,
+    # Rendered in memory (nothing written to the working directory) and cached on
+    # its inputs, including the minute it is generated in
+    generated_at = report_timestamp()
+    report_bytes, _ = pipeline.run("report", lambda: get_career_report(
         user_name=base_name,
         resume_data=structured_info,
         jd_skills=jd_skills,
         score_data=score_data,
         llm_feedback=explanation,
-        projects=project_list
+        projects=project_list,
+        generated_at=generated_at
+    ), base_name, structured_info, jd_skills, score_data, explanation, project_list, generated_at)
+    st.download_button(
+        label="Download Report",
+        data=report_bytes,
+        file_name=filename,
+        mime="application/pdf"
     )
-    with open(filename, "rb") as f:
-        st.download_button(
-            label="Download Report",
-            data=f,
-            file_name=filename,
-            mime="application/pdf"
-        )
+
+# ------------------ PIPELINE DEBUG ------------------
+# Rendered last so it covers every stage touched in this rerun
+with st.sidebar.expander("🛠️ Pipeline Debug"):
+    st.caption("Stages recompute only when their inputs change.")
+    st.dataframe(pipeline.debug_rows())
+
+# ------------------ BACKGROUND WARM-UP ------------------
+# Runs after the page has been painted; later AI actions find the models loaded
+start_background_warm_up()
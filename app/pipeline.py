@@ -0,0 +1,87 @@
+import time
+from utils import hash_payload
+
+# Stage -> stages whose outputs it consumes. When a stage recomputes, every
+# stage downstream of it along these edges is dropped.
+STAGE_GRAPH = {
+    "parse": [],
+    "skills": ["parse"],
+    "jd_extraction": [],
+    "comparison": ["skills", "jd_extraction"],
+    "score": ["skills", "jd_extraction"],
+    "feedback": ["skills", "jd_extraction"],
+    "projects": ["parse", "jd_extraction", "score"],
+    "rewrites": ["parse"],
+    "job_matches": ["parse"],
+    "ranking": ["jd_extraction"],
+    "report": ["parse", "jd_extraction", "score", "feedback", "projects"],
+}
+
+
+class StagePipeline:
+    """
+    Per-session memo of the app's stages (parse -> skills -> JD extraction ->
+    score -> feedback / projects / rewrites -> report).
+
+    Each stage's result is stored with a hash of its inputs; a rerun with the
+    same inputs returns the stored result instead of recomputing, and a
+    recompute invalidates the stages downstream of it. Timings for
+    the current rerun are kept for the debug panel.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self.rerun_log = {}
+
+    def begin_rerun(self):
+        self.rerun_log = {}
+
+    def run(self, name, fn, *inputs, keep=None):
+        """
+        Returns (value, computed). `fn` is only called when `inputs` differ
+        from the ones the stored result was computed from. A fresh result
+        makes every downstream stage stale; it is itself only stored if
+        `keep(value)` is true, so e.g. an LLM error is retried next rerun.
+        """
+        key = hash_payload(inputs)
+        stored = self._results.get(name)
+        if stored is not None and stored[0] == key:
+            self.rerun_log[name] = {"status": "cached", "ms": 0.0}
+            return stored[1], False
+
+        start = time.perf_counter()
+        value = fn()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.invalidate(name)
+        if keep is None or keep(value):
+            self._results[name] = (key, value)
+            self.rerun_log[name] = {"status": "computed", "ms": elapsed_ms}
+        else:
+            self.rerun_log[name] = {"status": "computed, not kept", "ms": elapsed_ms}
+        return value, True
+
+    def invalidate(self, name):
+        """
+        Drops the stored result of `name` and of every stage downstream of it.
+        """
+        stale, seen = [name], {name}
+        while stale:
+            stage = stale.pop()
+            self._results.pop(stage, None)
+            for downstream, depends_on in STAGE_GRAPH.items():
+                if stage in depends_on and downstream not in seen:
+                    seen.add(downstream)
+                    stale.append(downstream)
+
+    def debug_rows(self):
+        rows = []
+        for name, depends_on in STAGE_GRAPH.items():
+            entry = self.rerun_log.get(name, {"status": "not run", "ms": 0.0})
+            rows.append({
+                "Stage": name,
+                "Depends on": ", ".join(depends_on) or "-",
+                "This rerun": entry["status"],
+                "Time (ms)": round(entry["ms"], 1)
+            })
+        return rows
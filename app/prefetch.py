@@ -0,0 +1,117 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from llm_scheduler import RequestCancelled
+
+# Off by default: prefetching spends LLM quota on actions the user may never click
+PREFETCH_AI_ACTIONS = os.environ.get("PREFETCH_AI_ACTIONS") == "1"
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "4"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_prefetch_executor():
+    """
+    Returns the process-wide pool shared by every session's prefetcher.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+    return _executor
+
+
+class _Task:
+    __slots__ = ("key", "future", "cancel_event")
+
+    def __init__(self, key, future, cancel_event):
+        self.key = key
+        self.future = future
+        self.cancel_event = cancel_event
+
+
+class Prefetcher:
+    """
+    Per-session speculative runner for AI actions.
+
+    Each action (feedback, projects, rewrites) has at most one job, tagged
+    with a hash of the inputs it was started from. When the inputs change the
+    old job is cancelled: dropped if it hasn't started, or told to give up its
+    place in the LLM scheduler queue if it is waiting there. A click asks for
+    the result under the current key and gets it only if it is ready.
+    """
+
+    def __init__(self, executor=None):
+        self._executor = executor
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def _cancel(self, task):
+        task.cancel_event.set()
+        task.future.cancel()
+
+    def update(self, jobs):
+        """
+        jobs maps action -> (input_key, fn). fn receives a cancel event and
+        runs in the background. Jobs already started for the same key are
+        kept; jobs for old keys or actions no longer listed are cancelled.
+        """
+        executor = self._executor or get_prefetch_executor()
+        with self._lock:
+            for action in list(self._tasks):
+                if action not in jobs:
+                    self._cancel(self._tasks.pop(action))
+
+            for action, (key, fn) in jobs.items():
+                task = self._tasks.get(action)
+                if task is not None and task.key == key:
+                    continue
+                if task is not None:
+                    self._cancel(task)
+                cancel_event = threading.Event()
+                self._tasks[action] = _Task(key, executor.submit(fn, cancel_event), cancel_event)
+
+    def cancel_all(self):
+        self.update({})
+
+    def take(self, action, key):
+        """
+        Returns the finished result for action under key, or None (not
+        prefetched, stale, failed, or still running). A job that is still
+        running is cancelled (it stays registered, so it is not restarted for
+        the same key) and the click runs it at normal priority; the
+        scheduler's single-flight merges the two if the job already reached
+        the provider.
+        """
+        with self._lock:
+            task = self._tasks.get(action)
+            if task is None or task.key != key:
+                return None
+            if not task.future.done():
+                self._cancel(task)
+                return None
+        if task.future.cancelled() or task.future.exception() is not None:
+            return None
+        return task.future.result()
+
+    def status(self):
+        """
+        action -> "ready" / "running" / "failed" / "cancelled", for the UI.
+        """
+        with self._lock:
+            tasks = dict(self._tasks)
+        statuses = {}
+        for action, task in tasks.items():
+            if task.future.cancelled():
+                statuses[action] = "cancelled"
+            elif not task.future.done():
+                statuses[action] = "running"
+            elif isinstance(task.future.exception(), RequestCancelled):
+                statuses[action] = "cancelled"
+            elif task.future.exception() is not None:
+                statuses[action] = "failed"
+            else:
+                statuses[action] = "ready"
+        return statuses
@@ -0,0 +1,122 @@
+import numpy as np
+from scipy import sparse
+from scoring import HIGH_FIT_SCORE, MEDIUM_FIT_SCORE
+
+
+def _normalize(skills):
+    return sorted({s.lower() for s in skills})
+
+
+def build_skill_matrix(skill_lists, vocabulary_index):
+    """
+    Encodes skill lists as a sparse 0/1 incidence matrix (rows x vocabulary).
+    """
+    rows, cols = [], []
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            rows.append(row)
+            cols.append(vocabulary_index[skill])
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(skill_lists), len(vocabulary_index)))
+
+
+class RankingResult:
+    """
+    Scores for N resumes x M JDs, computed in one sparse matrix product.
+
+    `scores[j, r]` matches calculate_resume_score(resume r, JD j)["score"].
+    Matched / missing skill lists are only materialised for the resumes a
+    caller actually looks at.
+    """
+
+    def __init__(self, vocabulary, resume_matrix, jd_matrix, scores, resume_ids, jd_ids):
+        self.vocabulary = vocabulary
+        self.resume_matrix = resume_matrix
+        self.jd_matrix = jd_matrix
+        self.scores = scores
+        self.resume_ids = resume_ids
+        self.jd_ids = jd_ids
+
+    @property
+    def fit_levels(self):
+        return np.select(
+            [self.scores >= HIGH_FIT_SCORE, self.scores >= MEDIUM_FIT_SCORE],
+            ["High", "Medium"],
+            default="Low"
+        )
+
+    def _row_skills(self, matrix, row):
+        return set(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]])
+
+    def matched_skills(self, jd, resume):
+        columns = self._row_skills(self.jd_matrix, jd) & self._row_skills(self.resume_matrix, resume)
+        return sorted(self.vocabulary[c] for c in columns)
+
+    def missing_skills(self, jd, resume):
+        columns = self._row_skills(self.jd_matrix, jd) - self._row_skills(self.resume_matrix, resume)
+        return sorted(self.vocabulary[c] for c in columns)
+
+    def top_k(self, k=10):
+        """
+        Returns {jd_id: [ranked resume dicts]} with the k best resumes per JD.
+        Ties keep upload order.
+        """
+        k = min(k, len(self.resume_ids))
+        fit_levels = self.fit_levels
+        ranking = {}
+        for jd in range(len(self.jd_ids)):
+            row = self.scores[jd]
+            if k < len(row):
+                candidates = np.argpartition(-row, k - 1)[:k]
+            else:
+                candidates = np.arange(len(row))
+            order = candidates[np.lexsort((candidates, -row[candidates]))]
+
+            ranking[self.jd_ids[jd]] = [
+                {
+                    "resume": self.resume_ids[r],
+                    "score": int(row[r]),
+                    "fit_level": str(fit_levels[jd, r]),
+                    "matched": self.matched_skills(jd, r),
+                    "missing": self.missing_skills(jd, r)
+                }
+                for r in order
+            ]
+        return ranking
+
+
+def rank_resumes(resume_skills, jd_skills, resume_ids=None, jd_ids=None):
+    """
+    Scores many resumes against one or many job descriptions at once.
+
+    Args:
+        resume_skills (list[list[str]]): Skills per resume.
+        jd_skills (list[list[str]]): Skills per job description.
+        resume_ids (list): Labels for resumes (defaults to positions).
+        jd_ids (list): Labels for JDs (defaults to positions).
+
+    Returns:
+        RankingResult
+    """
+    resume_skills = [_normalize(skills) for skills in resume_skills]
+    jd_skills = [_normalize(skills) for skills in jd_skills]
+    resume_ids = list(resume_ids) if resume_ids is not None else list(range(len(resume_skills)))
+    jd_ids = list(jd_ids) if jd_ids is not None else list(range(len(jd_skills)))
+
+    vocabulary = sorted({s for skills in resume_skills + jd_skills for s in skills})
+    vocabulary_index = {skill: i for i, skill in enumerate(vocabulary)}
+
+    resume_matrix = build_skill_matrix(resume_skills, vocabulary_index)
+    jd_matrix = build_skill_matrix(jd_skills, vocabulary_index)
+
+    # (M x V) @ (V x N): matched-skill counts for every JD/resume pair
+    matched_counts = (jd_matrix @ resume_matrix.T).toarray()
+    jd_sizes = np.asarray(jd_matrix.sum(axis=1), dtype=np.float32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = np.where(jd_sizes > 0, matched_counts / jd_sizes * 100, 0)
+    # Same integer truncation as calculate_resume_score; the epsilon guards
+    # float32 ratios like 0.29 * 100 = 28.999998
+    scores = np.floor(coverage + 1e-4).astype(np.int32)
+
+    return RankingResult(vocabulary, resume_matrix, jd_matrix, scores, resume_ids, jd_ids)
@@ -1,6 +1,8 @@
 from fpdf import FPDF
 import datetime
 import re
+from concurrent.futures import ProcessPoolExecutor
+from utils import LRUCache, hash_payload
 
 def remove_emojis(text):
     """
@@ -10,7 +12,17 @@ def remove_emojis(text):
     
 
 
-def export_career_report(filename, user_name, resume_data, jd_skills, score_data, llm_feedback, projects):
+def report_timestamp():
+    """
+    The "Generated on" stamp, to the minute, so a cached render stays current.
+    """
+    return datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
+
+
+def render_career_report(user_name, resume_data, jd_skills, score_data, llm_feedback, projects, generated_at=None):
+    """
+    Renders the career report entirely in memory and returns the PDF bytes.
+    """
     pdf = FPDF()
     pdf.add_page()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -19,7 +31,8 @@ def export_career_report(filename, user_name, resume_data, jd_skills, score_data
     pdf.cell(0, 10, "AI Career Coach Report", ln=True)
 
     pdf.set_font("Arial", '', 12)
-    pdf.cell(0, 10, f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+    generated_at = generated_at or datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    pdf.cell(0, 10, f"Generated on: {generated_at}", ln=True)
     pdf.ln(10)
 
     # Resume Section
@@ -64,5 +77,53 @@ def export_career_report(filename, user_name, resume_data, jd_skills, score_data
             pdf.multi_cell(0, 8, f" {project}")
         pdf.ln(5)
 
-    # Save
-    pdf.output(filename)
+    # fpdf returns a latin-1 str for dest="S"; fpdf2 returns a bytearray
+    data = pdf.output(dest="S")
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+_report_cache = LRUCache(max_entries=64)
+
+
+def get_career_report(user_name, resume_data, jd_skills, score_data, llm_feedback, projects, generated_at=None):
+    """
+    Returns report bytes, reusing the last render when none of the inputs
+    changed, so repeated clicks cost nothing. The timestamp is part of the
+    key (default: report_timestamp()), so a cached report is never dated
+    earlier than the current minute.
+    """
+    generated_at = generated_at or report_timestamp()
+    key = hash_payload([user_name, resume_data, jd_skills, score_data, llm_feedback, projects, generated_at])
+    report = _report_cache.get(key)
+    if report is None:
+        report = render_career_report(user_name, resume_data, jd_skills, score_data, llm_feedback, projects,
+                                      generated_at)
+        _report_cache.put(key, report)
+    return report
+
+
+def _render_candidate_report(candidate):
+    return render_career_report(**candidate)
+
+
+def render_career_reports(candidates, max_workers=None):
+    """
+    Renders reports for many candidates in parallel worker processes.
+
+    Args:
+        candidates (list[dict]): Keyword arguments for render_career_report, one dict per candidate.
+        max_workers (int): Worker processes (defaults to the CPU count).
+
+    Returns:
+        list[bytes]: PDF bytes in the same order as `candidates`.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_candidate_report, candidates, chunksize=8))
+
+
+def export_career_report(filename, user_name, resume_data, jd_skills, score_data, llm_feedback, projects):
+    """
+    Renders the report and writes it to `filename`.
+    """
+    with open(filename, "wb") as f:
+        f.write(render_career_report(user_name, resume_data, jd_skills, score_data, llm_feedback, projects))
@@ -1,22 +1,147 @@
 import os
-import PyPDF2
 import json
 import re
 import fitz
+from utils import LRUCache, hash_bytes
+from skill_matcher import get_skill_matcher
+from resume_store import ResumeStore
+
+# === Single-pass PDF extraction engine ===
+# Long documents are split into page ranges and extracted in worker processes
+# once they reach this many pages.
+PARALLEL_PAGE_THRESHOLD = 16
+
+
+def _open_pdf(source):
+    """
+    Opens a PDF from a file path or raw bytes with PyMuPDF.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"File not found: {source}")
+    return fitz.open(source)
+
+
+def _extract_page(page):
+    """
+    Extracts text, links and layout blocks from a single page in one pass.
+    """
+    blocks = []
+    text_parts = []
+    for x0, y0, x1, y1, block_text, _, block_type in page.get_text("blocks"):
+        if block_type != 0:  # skip image blocks
+            continue
+        blocks.append({"bbox": (x0, y0, x1, y1), "text": block_text})
+        text_parts.append(block_text)
+
+    links = [link["uri"] for link in page.get_links() if link.get("uri")]
+
+    return {
+        "page": page.number,
+        "text": "".join(text_parts),
+        "links": links,
+        "blocks": blocks
+    }
+
+
+def _extract_page_range(source, start, stop):
+    """
+    Worker entry point: opens its own copy of the document and extracts a page range.
+    """
+    with _open_pdf(source) as doc:
+        return [_extract_page(doc.load_page(i)) for i in range(start, stop)]
+
+
+def iter_pdf_pages(source, max_pages=None, max_bytes=None):
+    """
+    Opens a PDF once and yields text, links and layout per page.
+
+    Args:
+        source (str | bytes): Path to the PDF file or its raw bytes.
+        max_pages (int): Stop after this many pages.
+        max_bytes (int): Stop once this many bytes of text have been yielded;
+            the last page is truncated to fit.
+
+    Yields:
+        dict: {"page", "text", "links", "blocks"}
+    """
+    emitted_bytes = 0
+    with _open_pdf(source) as doc:
+        page_count = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+        for page_no in range(page_count):
+            page_data = _extract_page(doc.load_page(page_no))
+
+            if max_bytes is not None:
+                encoded = page_data["text"].encode("utf-8")
+                remaining = max_bytes - emitted_bytes
+                if len(encoded) >= remaining:
+                    page_data["text"] = encoded[:remaining].decode("utf-8", errors="ignore")
+                    yield page_data
+                    return
+                emitted_bytes += len(encoded)
+
+            yield page_data
+
+
+def _iter_pdf_pages_parallel(source, page_count, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    step = -(-page_count // workers)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_page_range, source, start, stop) for start, stop in ranges]
+        for future in futures:
+            yield from future.result()
+
+
+def _normalize_text(text):
+    return text.replace('\n', ' ').replace('\r', '').strip()
+
+
+def extract_resume(source, max_pages=None, max_bytes=None, workers=1):
+    """
+    Extracts text and links from a PDF with a single open of the document.
+
+    Args:
+        source (str | bytes): Path to the PDF file or its raw bytes.
+        max_pages (int): Optional page cap for huge uploads.
+        max_bytes (int): Optional cap on extracted text size.
+        workers (int): Worker processes for long documents (page-parallel).
+
+    Returns:
+        dict: {"text", "links", "page_count"}
+    """
+    pages = None
+    if workers > 1 and max_bytes is None:
+        with _open_pdf(source) as doc:
+            page_count = doc.page_count if max_pages is None else min(max_pages, doc.page_count)
+        if page_count >= PARALLEL_PAGE_THRESHOLD:
+            pages = _iter_pdf_pages_parallel(source, page_count, workers)
+
+    if pages is None:
+        pages = iter_pdf_pages(source, max_pages=max_pages, max_bytes=max_bytes)
+
+    text_parts, links, page_count = [], [], 0
+    for page_data in pages:
+        text_parts.append(page_data["text"])
+        links.extend(page_data["links"])
+        page_count += 1
+
+    return {
+        "text": _normalize_text("".join(text_parts)),
+        "links": links,
+        "page_count": page_count
+    }
+
 
 def extract_links_from_pdf(pdf_path):
     """
     Extracts all URI hyperlinks from the PDF (e.g., LinkedIn, GitHub).
     """
     links = []
-    doc = fitz.open(pdf_path)
-
-    for page in doc:
-        for link in page.get_links():
-            uri = link.get("uri", None)
-            if uri:
-                links.append(uri)
-
+    for page_data in iter_pdf_pages(pdf_path):
+        links.extend(page_data["links"])
     return links
 
 def extract_text_from_pdf(pdf_path, save_as_json=True):
@@ -30,16 +155,7 @@ def extract_text_from_pdf(pdf_path, save_as_json=True):
     Returns:
         str: Extracted text.
     """
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"File not found: {pdf_path}")
-
-    text = ""
-    with open(pdf_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text() or ""
-
-    text = text.replace('\n', ' ').replace('\r', '').strip()
+    text = extract_resume(pdf_path)["text"]
 
     if save_as_json:
         output_path = "data/parsed_resumes"
@@ -56,14 +172,6 @@ def extract_text_from_pdf(pdf_path, save_as_json=True):
 
     return text
 
-# Predefined list of common tech skills (expandable)
-COMMON_SKILLS = [
-    "python", "java", "c++", "sql", "excel", "power bi", "tableau",
-    "tensorflow", "pytorch", "nlp", "opencv", "machine learning",
-    "deep learning", "data analysis", "data science", "html", "css",
-    "javascript", "flask", "django", "aws", "azure", "git"
-]
-
 def preprocess_resume_text(text, links = None):
     """
     Extracts structured fields from raw resume text.
@@ -95,12 +203,8 @@ def preprocess_resume_text(text, links = None):
     # If no links found, fallback to old regex method (optional)
 
 
-    # 5. Skills (case insensitive keyword match)
-    found_skills = []
-    for skill in COMMON_SKILLS:
-        if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE):
-            found_skills.append(skill.lower())
-    data["skills"] = list(set(found_skills))  # Remove duplicates
+    # 5. Skills (one pass of the shared taxonomy matcher, aliases -> canonical names)
+    data["skills"] = get_skill_matcher().extract(text)
 
     # 6. Education Section (basic heuristic)
     edu_match = re.search(r"(education|qualifications)(.*?)(experience|skills|projects|summary|$)", text, re.IGNORECASE | re.DOTALL)
@@ -116,4 +220,85 @@ def preprocess_resume_text(text, links = None):
     data["experience"] = exp_text if exp_text and len(exp_text) > 30 else None
 
 
-    return data
\ No newline at end of file
+    return data
+
+
+# === Content-addressed parse cache ===
+class ParseCache:
+    """
+    Caches parsed resumes by the SHA-256 of the PDF bytes.
+
+    Recent results are held in an in-memory LRU; every distinct resume is
+    also stored once in the ResumeStore so it survives process restarts.
+    """
+
+    def __init__(self, store_path="data/resumes.sqlite", max_entries=128):
+        self.store_path = store_path
+        self.memory = LRUCache(max_entries)
+        self._store = None
+
+    @property
+    def store(self):
+        # Opened on first use so importing the parser never creates a database
+        if self._store is None:
+            self._store = ResumeStore(self.store_path)
+        return self._store
+
+    def get(self, key):
+        """
+        Looks up a parsed upload; a hit from either tier counts as a repeat
+        upload in the store.
+        """
+        result = self.memory.get(key)
+        if result is not None:
+            self.store.touch(key)
+            return result
+
+        result = self.store.get(key)
+        if result is not None:
+            self.store.touch(key)
+            self.memory.put(key, result)
+        return result
+
+    def put(self, key, result, file_name=None):
+        self.memory.put(key, result)
+        self.store.put(result, file_name=file_name)
+
+
+parse_cache = ParseCache()
+
+# Resumes are short; anything past this is not worth parsing on the request path
+MAX_RESUME_PAGES = 30
+
+
+def parse_resume_bytes(pdf_bytes, cache=parse_cache, file_name=None):
+    """
+    Parses an uploaded resume, reusing a cached result for identical PDF bytes.
+
+    Args:
+        pdf_bytes (bytes): Raw PDF content.
+        cache (ParseCache): Cache to consult; pass None to always re-parse.
+        file_name (str): Original upload name, recorded with new resumes.
+
+    Returns:
+        dict: {"hash", "raw_text", "links", "structured"}
+    """
+    key = hash_bytes(pdf_bytes)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    extracted = extract_resume(pdf_bytes, max_pages=MAX_RESUME_PAGES)
+    raw_text, links = extracted["text"], extracted["links"]
+
+    result = {
+        "hash": key,
+        "raw_text": raw_text,
+        "links": links,
+        "structured": preprocess_resume_text(raw_text, links)
+    }
+
+    if cache is not None:
+        cache.put(key, result, file_name=file_name)
+    return result
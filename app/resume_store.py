@@ -0,0 +1,147 @@
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+from utils import connect_sqlite, hash_bytes
+
+
+class ResumeStore:
+    """
+    Single SQLite store for parsed resumes, keyed by the PDF content hash.
+
+    Repeat uploads of the same file are one row (with an upload counter)
+    instead of a new JSON file per rerun. Raw text is zlib-compressed;
+    email and skills are indexed for fast lookup.
+    """
+
+    def __init__(self, path="data/resumes.sqlite"):
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    hash TEXT PRIMARY KEY,
+                    file_name TEXT,
+                    email TEXT,
+                    raw_text BLOB NOT NULL,
+                    links TEXT NOT NULL,
+                    structured TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    upload_count INTEGER NOT NULL DEFAULT 1
+                );
+                CREATE INDEX IF NOT EXISTS idx_resumes_email ON resumes(email);
+                CREATE TABLE IF NOT EXISTS resume_skills (
+                    skill TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (skill, hash)
+                ) WITHOUT ROWID;
+            """)
+
+    def put(self, parsed, file_name=None):
+        """
+        Stores a parse result ({"hash", "raw_text", "links", "structured"}).
+        Returns True if it was new, False if it was a repeat upload.
+        """
+        structured = parsed["structured"]
+        email = (structured.get("email") or "").lower() or None
+        now = time.time()
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO resumes "
+                "(hash, file_name, email, raw_text, links, structured, created_at, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (parsed["hash"], file_name, email, zlib.compress(parsed["raw_text"].encode("utf-8")),
+                 json.dumps(parsed["links"]), json.dumps(structured, separators=(",", ":")), now, now)
+            )
+            if cursor.rowcount == 0:
+                self._conn.execute(
+                    "UPDATE resumes SET upload_count = upload_count + 1, last_seen = ? WHERE hash = ?",
+                    (now, parsed["hash"])
+                )
+                return False
+
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO resume_skills (skill, hash) VALUES (?, ?)",
+                [(skill.lower(), parsed["hash"]) for skill in structured.get("skills", [])]
+            )
+            return True
+
+    def touch(self, content_hash):
+        """
+        Records a repeat upload of a stored resume (e.g. one served from the
+        parse cache). Returns False if the hash is not stored.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE resumes SET upload_count = upload_count + 1, last_seen = ? WHERE hash = ?",
+                (time.time(), content_hash)
+            )
+        return cursor.rowcount > 0
+
+    def get(self, content_hash):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw_text, links, structured FROM resumes WHERE hash = ?", (content_hash,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "hash": content_hash,
+            "raw_text": zlib.decompress(row[0]).decode("utf-8"),
+            "links": json.loads(row[1]),
+            "structured": json.loads(row[2])
+        }
+
+    def _summaries(self, where, params):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT hash, file_name, email, upload_count, last_seen FROM resumes " + where, params
+            ).fetchall()
+        return [
+            {"hash": r[0], "file_name": r[1], "email": r[2], "upload_count": r[3], "last_seen": r[4]}
+            for r in rows
+        ]
+
+    def find_by_email(self, email):
+        return self._summaries("WHERE email = ?", (email.lower(),))
+
+    def find_by_skill(self, skill):
+        return self._summaries(
+            "WHERE hash IN (SELECT hash FROM resume_skills WHERE skill = ?)", (skill.lower(),)
+        )
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def import_json_dir(self, directory="data/parsed_resumes"):
+        """
+        One-off migration of the legacy per-rerun JSON files. Those files have
+        no PDF bytes, so records are keyed by a hash of their raw text, and
+        identical texts collapse into one row. Returns the number of new rows.
+        """
+        from resume_parser import preprocess_resume_text
+
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            raw_text = data.get("raw_text") if isinstance(data, dict) else None
+            if not raw_text:
+                continue  # *_structured.json files carry no text to re-derive from
+
+            parsed = {
+                "hash": "text-" + hash_bytes(raw_text.encode("utf-8")),
+                "raw_text": raw_text,
+                "links": [],
+                "structured": preprocess_resume_text(raw_text)
+            }
+            imported += self.put(parsed, file_name=data.get("file_name"))
+        return imported
@@ -1,3 +1,19 @@
+import threading
+import numpy as np
+from skill_matcher import get_skill_matcher
+
+HIGH_FIT_SCORE = 80
+MEDIUM_FIT_SCORE = 50
+
+
+def fit_level_for(score):
+    if score >= HIGH_FIT_SCORE:
+        return "High"
+    elif score >= MEDIUM_FIT_SCORE:
+        return "Medium"
+    return "Low"
+
+
 def calculate_resume_score(resume_skills, jd_skills):
     resume_set = set([s.lower() for s in resume_skills])
     jd_set = set([s.lower() for s in jd_skills])
@@ -6,13 +22,7 @@ def calculate_resume_score(resume_skills, jd_skills):
     missing = jd_set - resume_set
 
     score = int((len(matched) / len(jd_set)) * 100) if jd_set else 0
-
-    if score >= 80:
-        fit_level = "High"
-    elif score >= 50:
-        fit_level = "Medium"
-    else:
-        fit_level = "Low"
+    fit_level = fit_level_for(score)
 
     return {
         "score": score,
@@ -20,3 +30,106 @@ def calculate_resume_score(resume_skills, jd_skills):
         "matched": list(matched),
         "missing": list(missing)
     }
+
+
+# === Semantic skill matching ===
+# Cosine similarity above which a resume skill earns partial credit for a JD skill
+SEMANTIC_MATCH_THRESHOLD = 0.6
+
+
+class SkillEmbeddingMatrix:
+    """
+    Normalized MiniLM embeddings for the skill vocabulary.
+
+    The whole taxonomy is embedded once per process (through the persistent
+    embedding cache); skills outside it are embedded on first sight and kept.
+    """
+
+    def __init__(self, vocabulary):
+        self._lock = threading.Lock()
+        self._index = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._add(vocabulary)
+
+    def _add(self, skills):
+        new_skills = [s for s in dict.fromkeys(skills) if s not in self._index]
+        if not new_skills:
+            return
+        from vector_store import embed_chunks  # keeps plain scoring free of the embedding stack
+
+        vectors = embed_chunks(new_skills)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        self._matrix = vectors if not self._index else np.vstack([self._matrix, vectors])
+        for skill in new_skills:
+            self._index[skill] = len(self._index)
+
+    def vectors(self, skills):
+        with self._lock:
+            self._add(skills)
+            return self._matrix[[self._index[s] for s in skills]]
+
+
+_skill_embeddings = None
+_skill_embeddings_lock = threading.Lock()
+
+
+def get_skill_embeddings():
+    global _skill_embeddings
+    if _skill_embeddings is None:
+        with _skill_embeddings_lock:
+            if _skill_embeddings is None:
+                _skill_embeddings = SkillEmbeddingMatrix(get_skill_matcher().vocabulary)
+    return _skill_embeddings
+
+
+def calculate_semantic_resume_score(resume_skills, jd_skills, threshold=SEMANTIC_MATCH_THRESHOLD):
+    """
+    Like calculate_resume_score, but a JD skill without an exact match earns
+    partial credit equal to its cosine similarity to the closest resume skill,
+    when that similarity clears `threshold`.
+    """
+    resume_list = sorted(set([s.lower() for s in resume_skills]))
+    jd_list = sorted(set([s.lower() for s in jd_skills]))
+    if not jd_list:
+        return {"score": 0, "fit_level": fit_level_for(0), "matched": [], "partial": [],
+                "missing": [], "best_matches": {}}
+
+    matched, partial, missing, best_matches = [], [], [], {}
+    credit = 0.0
+
+    if resume_list:
+        embeddings = get_skill_embeddings()
+        # (JD x resume) cosine similarities in one matrix product
+        similarity = embeddings.vectors(jd_list) @ embeddings.vectors(resume_list).T
+        best = similarity.argmax(axis=1)
+        best_similarity = similarity[np.arange(len(jd_list)), best]
+    resume_set = set(resume_list)
+
+    for i, skill in enumerate(jd_list):
+        if skill in resume_set:
+            matched.append(skill)
+            credit += 1.0
+            continue
+
+        if not resume_list:
+            missing.append(skill)
+            continue
+
+        closest, closeness = resume_list[best[i]], float(best_similarity[i])
+        if closeness >= threshold:
+            partial.append({"skill": skill, "match": closest, "similarity": round(closeness, 2)})
+            credit += closeness
+        else:
+            missing.append(skill)
+            best_matches[skill] = {"match": closest, "similarity": round(closeness, 2)}
+
+    score = int(credit / len(jd_list) * 100)
+
+    return {
+        "score": score,
+        "fit_level": fit_level_for(score),
+        "matched": matched,
+        "partial": partial,
+        "missing": missing,
+        "best_matches": best_matches
+    }
@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import threading
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "skills_taxonomy.json")
+
+# A skill must not touch other word characters, or the symbols that are part
+# of names like "c++" / "c#" (plain \b fails right after a "+").
+_LEFT_BOUNDARY = r"(?<![\w+#])"
+_RIGHT_BOUNDARY = r"(?![\w+#])"
+
+# Names that are also everyday words or short letter pairs only count as a
+# skill when written the way the skill is: "acronym" terms must be upper-case
+# ("ML", not "ml"), "proper" terms must be capitalised ("Rust", not "rust"),
+# and "phrase" terms only match through a longer alias ("communication skills").
+AMBIGUOUS_TERMS = {
+    "ml": "acronym",
+    "dl": "acronym",
+    "rl": "acronym",
+    "rails": "proper",
+    "spark": "proper",
+    "swift": "proper",
+    "rust": "proper",
+    "react": "proper",
+    "communication": "phrase",
+    "leadership": "phrase",
+}
+
+
+def normalize_term(term):
+    return " ".join(term.lower().split())
+
+
+def _char_pattern(char):
+    return r"\s+" if char == " " else re.escape(char)
+
+
+def _written_as_skill(surface, rule):
+    if rule == "acronym":
+        return surface.isupper()
+    if rule == "proper":
+        return surface[:1].isupper()
+    return rule != "phrase"
+
+
+def _trie_to_pattern(node):
+    """
+    Turns a character trie into a compact regex where shared prefixes are
+    matched once, so pattern size and scan cost grow gently with taxonomy size.
+    """
+    is_terminal = "" in node
+    branches = [char for char in node if char]
+    if not branches:
+        return None
+
+    alternatives, single_chars = [], []
+    for char in sorted(branches):
+        tail = _trie_to_pattern(node[char])
+        if tail is None and char != " ":
+            single_chars.append(re.escape(char))
+        else:
+            alternatives.append(_char_pattern(char) + (tail or ""))
+
+    if single_chars:
+        alternatives.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+
+    pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if is_terminal:
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+class SkillMatcher:
+    """
+    Matches a skill taxonomy against text in a single pass.
+
+    The taxonomy maps canonical skill names to aliases ("kubernetes": ["k8s"]).
+    All names and aliases are compiled once into one trie-shaped regex, so a
+    scan costs one pass over the text regardless of how many skills exist.
+    Terms listed in ambiguous_terms only count when their case allows it.
+    """
+
+    def __init__(self, taxonomy, ambiguous_terms=AMBIGUOUS_TERMS):
+        self.ambiguous_terms = {normalize_term(term): rule for term, rule in ambiguous_terms.items()}
+        self.aliases = {}
+        for canonical, aliases in taxonomy.items():
+            canonical_norm = normalize_term(canonical)
+            for term in [canonical, *aliases]:
+                self.aliases.setdefault(normalize_term(term), canonical_norm)
+
+        trie = {}
+        for term in self.aliases:
+            if self.ambiguous_terms.get(term) == "phrase":
+                continue
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        body = _trie_to_pattern(trie) or r"(?!)"
+        self.pattern = re.compile(_LEFT_BOUNDARY + "(" + body + ")" + _RIGHT_BOUNDARY, re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def vocabulary(self):
+        return sorted(set(self.aliases.values()))
+
+    def canonical(self, term):
+        """
+        Returns the canonical skill for a name or alias, or None.
+        """
+        return self._lookup(" ".join(term.split()))
+
+    def _lookup(self, surface):
+        term = normalize_term(surface)
+        rule = self.ambiguous_terms.get(term)
+        if rule is not None and not _written_as_skill(surface, rule):
+            return None
+        return self.aliases.get(term)
+
+    def find(self, text):
+        """
+        Returns (canonical_skill, start, end) for every skill mention in text.
+        """
+        found = []
+        for match in self.pattern.finditer(text):
+            skill = self._lookup(match.group(1))
+            if skill is not None:
+                found.append((skill, match.start(1), match.end(1)))
+        return found
+
+    def extract(self, text):
+        """
+        Returns the sorted, de-duplicated canonical skills mentioned in text.
+        """
+        return sorted({skill for skill, _, _ in self.find(text)})
+
+
+_default_matcher = None
+_default_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """
+    Returns the process-wide matcher for the bundled taxonomy, built on first use.
+    """
+    global _default_matcher
+    if _default_matcher is None:
+        with _default_matcher_lock:
+            if _default_matcher is None:
+                _default_matcher = SkillMatcher.from_file()
+    return _default_matcher
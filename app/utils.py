@@ -1,10 +1,298 @@
-def split_text_into_chunks(text, chunk_size=500):
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+CHUNK_TOKENS = 128
+CHUNK_OVERLAP_TOKENS = 32
+
+SECTION_HEADINGS = {
+    "summary", "professional summary", "objective", "profile", "about", "about me",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "education", "skills", "technical skills", "core competencies", "projects", "personal projects",
+    "certifications", "awards", "achievements", "publications", "languages", "interests",
+    "volunteering", "volunteer experience", "job description", "responsibilities",
+    "requirements", "qualifications", "preferred qualifications", "what you will do", "about the role"
+}
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_BULLET_MARKER = re.compile(r"[•●▪◦■‣∙]|\s[-*–]\s")
+MIN_RESUME_LINE_WORDS = 4
+MAX_HEADER_WORDS = 40  # a name / contact block before the first heading is at most this long
+_CONTACT_TOKEN = re.compile(
+    r"\S+@\S+\.\S+|(?:https?://|www\.)\S+|\S*(?:linkedin|github)\.com\S*|(?<!\w)\+?\d[\d\-() ]{7,}\d(?!\w)"
+)
+
+
+def _heading_pattern(heading):
+    # PDF extraction sometimes splits a word ("Summar y", "Technic al Skills")
+    return r"\s+".join(" ?".join(re.escape(c) for c in word) for word in heading.split())
+
+
+# Title-case or upper-case headings inside flattened text; prose mentions are lower-case
+_INLINE_HEADING = re.compile(r"(?<!\w)(?:{})(?!\w)\s*:?".format("|".join(
+    _heading_pattern(variant)
+    for heading in sorted(SECTION_HEADINGS, key=len, reverse=True)
+    for variant in (heading.title(), heading.upper())
+)))
+
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return len(text) // 4 + 1
+
+
+def is_section_heading(line):
+    """
+    True for lines like "EXPERIENCE", "Technical Skills:" or "## Projects".
+    """
+    name = line.strip().strip("#*:-_ ").lower()
+    if not name or len(name.split()) > 5:
+        return False
+    if name in SECTION_HEADINGS:
+        return True
+    stripped = line.strip()
+    return stripped.endswith(":") or (stripped.isupper() and any(c.isalpha() for c in stripped))
+
+
+def _iter_sections(text):
+    """
+    Yields (heading, units) per section; units are the section's sentences,
+    with each non-empty line split at sentence boundaries.
+    """
+    heading, units = "", []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            continue
+        if is_section_heading(line):
+            if units:
+                yield heading, units
+            heading, units = line, []
+            continue
+        units.extend(part for part in _SENTENCE_BOUNDARY.split(line) if part)
+    if units:
+        yield heading, units
+
+
+def _split_long_unit(unit, max_tokens):
+    words = unit.split()
+    step = max(1, max_tokens * 2 // 3)  # ~1.5 estimated tokens per word
+    for i in range(0, len(words), step):
+        yield " ".join(words[i:i + step])
+
+
+def iter_text_chunks(text, max_tokens=CHUNK_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS):
+    """
+    Yields section-aware chunks for embedding.
+
+    Chunks never cross a section heading and only break between sentences
+    (or lines). Each chunk starts with its section heading, and consecutive
+    chunks in a section share up to `overlap_tokens` of trailing sentences.
+    """
+    for heading, units in _iter_sections(text):
+        prefix = [heading] if heading else []
+        budget = max_tokens - (estimate_tokens(heading) if heading else 0)
+
+        sentences = []
+        for unit in units:
+            if estimate_tokens(unit) > budget:
+                sentences.extend(_split_long_unit(unit, budget))
+            else:
+                sentences.append(unit)
+
+        window, size = [], 0
+        for sentence in sentences:
+            cost = estimate_tokens(sentence)
+            if window and size + cost > budget:
+                yield "\n".join(prefix + window)
+                # Carry the tail of this chunk over as overlap for the next one
+                carried, carried_size = [], 0
+                for previous in reversed(window):
+                    previous_cost = estimate_tokens(previous)
+                    if carried_size + previous_cost > overlap_tokens or carried_size + previous_cost + cost > budget:
+                        break
+                    carried.insert(0, previous)
+                    carried_size += previous_cost
+                window, size = carried, carried_size
+            window.append(sentence)
+            size += cost
+        if window:
+            yield "\n".join(prefix + window)
+
+
+def split_text_into_chunks(text, max_tokens=CHUNK_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS):
     """
     Splits text into smaller chunks for embedding.
     """
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), chunk_size):
-        chunk = " ".join(words[i:i + chunk_size])
-        chunks.append(chunk)
-    return chunks
+    return list(iter_text_chunks(text, max_tokens, overlap_tokens))
+
+
+def _iter_resume_sections(text):
+    """
+    Splits a resume at its section headings (own lines, or inline in
+    flattened text) and drops the headings and the name / contact block.
+    """
+    for line in text.splitlines():
+        if is_section_heading(line):
+            continue
+        line = _CONTACT_TOKEN.sub(" ", line)
+        sections = _INLINE_HEADING.split(line)
+        # Text before the first inline heading is the header: name, title, contact details
+        if len(sections) > 1 and len(sections[0].split()) <= MAX_HEADER_WORDS:
+            sections = sections[1:]
+        yield from sections
+
+
+def iter_resume_lines(text, min_words=MIN_RESUME_LINE_WORDS):
+    """
+    Yields the resume's individual statements: bullet points and sentences.
+
+    The parser flattens line breaks to spaces, so section headings, bullet
+    markers and sentence ends are the boundaries that survive. Contact
+    details, the header before the first heading, headings and fragments
+    shorter than `min_words` are skipped.
+    """
+    for section in _iter_resume_sections(text):
+        for item in _BULLET_MARKER.split(section):
+            for sentence in _SENTENCE_BOUNDARY.split(item):
+                sentence = " ".join(sentence.split())
+                if len(sentence.split()) >= min_words:
+                    yield sentence
+
+
+def assemble_context(ranked_chunks, token_budget):
+    """
+    Packs retrieved chunks, best first, into at most `token_budget` tokens.
+
+    Lines already taken from a better chunk (exact repeats, or the overlap
+    between neighbouring chunks) are dropped, and a chunk that adds nothing
+    new is skipped. Chunks that don't fit are skipped so a smaller, lower
+    ranked one can still use the remaining budget.
+    """
+    seen, parts, used = set(), [], 0
+    for chunk in ranked_chunks:
+        lines = chunk.split("\n")
+        heading = lines[0] if len(lines) > 1 and is_section_heading(lines[0]) else None
+        body = lines[1:] if heading else lines
+
+        new_lines = []
+        for line in body:
+            key = " ".join(line.lower().split())
+            if key and key not in seen:
+                new_lines.append(line)
+                seen.add(key)
+        if not new_lines:
+            continue
+
+        part = "\n".join(([heading] if heading else []) + new_lines)
+        cost = estimate_tokens(part)
+        if used + cost > token_budget:
+            for line in new_lines:
+                seen.discard(" ".join(line.lower().split()))
+            continue
+        parts.append(part)
+        used += cost
+    return "\n\n".join(parts)
+
+
+def hash_bytes(data):
+    """
+    Returns the SHA-256 hex digest of raw bytes (e.g. an uploaded PDF).
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_payload(payload):
+    """
+    Returns a stable SHA-256 hex digest for any JSON-serialisable object.
+    Keys are sorted so that logically equal dicts hash the same.
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hash_bytes(canonical.encode("utf-8"))
+
+
+def truncate_partial_line(path, block_bytes=65536):
+    """
+    Cuts an unterminated last line (left by a crashed writer) off an
+    append-only text file, so the next append starts on a fresh line.
+    """
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        if not end:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            start = max(0, position - block_bytes)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU cache shared by the in-memory cache tiers.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+def connect_sqlite(path):
+    """
+    Opens a SQLite database shared by threads and app worker processes.
+    WAL lets readers proceed while another process writes; the busy timeout
+    makes concurrent writers wait instead of failing with "database is locked".
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -1,15 +1,178 @@
-from sentence_transformers import SentenceTransformer
+import os
+import json
+import threading
+from contextlib import contextmanager
 import faiss
 import numpy as np
+from embedding_backends import backend_cache_name, get_embedding_backend
+from embedding_service import get_embedding_service
+from utils import LRUCache, assemble_context, hash_bytes, hash_payload, truncate_partial_line
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within one process
+    fcntl = None
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+def get_embedding_model():
+    """
+    Returns the process-wide embedding backend (see EMBEDDING_BACKEND), loading
+    it on first use. Importing this module stays cheap for sessions that never
+    embed anything.
+    """
+    return get_embedding_backend(EMBEDDING_MODEL_NAME)
+
+
+# === Embedding cache ===
+class EmbeddingCache:
+    """
+    Two-tier cache of chunk embeddings keyed by model name + SHA-256 of the chunk.
+
+    The memory tier is a bounded LRU. The disk tier is an append-only float32
+    matrix (vectors.f32, read through np.memmap) plus an index file mapping
+    text hashes to row numbers, so embeddings survive process restarts.
+    Appends take an exclusive file lock, so several app or batch processes
+    can share one cache directory.
+    """
+
+    def __init__(self, model_name, cache_dir="data/embedding_cache", max_entries=4096):
+        self.model_name = model_name
+        self.cache_dir = os.path.join(cache_dir, model_name.replace("/", "_"))
+        self.vectors_path = os.path.join(self.cache_dir, "vectors.f32")
+        self.index_path = os.path.join(self.cache_dir, "index.tsv")
+        self.meta_path = os.path.join(self.cache_dir, "meta.json")
+        self.lock_path = os.path.join(self.cache_dir, ".lock")
+
+        self.memory = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._dim = None
+        self._mmap = None
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            self._dim = json.load(f)["dim"]
+
+        # A torn append can leave a partial row at the end; only whole rows count
+        stored_rows = os.path.getsize(self.vectors_path) // (4 * self._dim) if os.path.exists(self.vectors_path) else 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    # Ignore torn writes: an unterminated line, or one whose vector never made it to disk
+                    if line.endswith("\n") and len(parts) == 2 and parts[1].isdigit() and int(parts[1]) < stored_rows:
+                        self._rows[parts[0]] = int(parts[1])
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_row(self, row):
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            n_rows = os.path.getsize(self.vectors_path) // (4 * self._dim)
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(n_rows, self._dim))
+        return np.array(self._mmap[row])
+
+    def get(self, text):
+        text_hash = hash_bytes(text.encode("utf-8"))
+        key = (self.model_name, text_hash)
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+
+        with self._lock:
+            row = self._rows.get(text_hash)
+            if row is None:
+                return None
+            vector = self._read_row(row)
+
+        self.memory.put(key, vector)
+        return vector
+
+    def put_many(self, texts, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with self._file_lock():
+                self._append(texts, vectors)
+
+    def _append(self, texts, vectors):
+        # Caller holds both the thread lock and the file lock
+        if self._dim is None:
+            if os.path.exists(self.meta_path):  # another process created the cache
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    self._dim = json.load(f)["dim"]
+            else:
+                self._dim = int(vectors.shape[1])
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dim": self._dim}, f)
+
+        row_bytes = 4 * self._dim
+        with open(self.vectors_path, "ab") as f:
+            # Drop a partial row left by a crashed writer, so new rows stay aligned
+            size = f.seek(0, os.SEEK_END)
+            if size % row_bytes:
+                f.truncate(size - size % row_bytes)
+            first_row = size // row_bytes
+            f.write(vectors.tobytes())
+
+        if os.path.exists(self.index_path):
+            truncate_partial_line(self.index_path)
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for offset, text in enumerate(texts):
+                text_hash = hash_bytes(text.encode("utf-8"))
+                self._rows[text_hash] = first_row + offset
+                self.memory.put((self.model_name, text_hash), vectors[offset])
+                f.write(f"{text_hash} {first_row + offset}\n")
+
+    def embed(self, texts, encode_fn):
+        """
+        Returns embeddings for texts, encoding only the ones not cached yet.
+        """
+        found = {}
+        for text in texts:
+            if text not in found:
+                found[text] = self.get(text)
+
+        missing = [text for text, vector in found.items() if vector is None]
+        if missing:
+            new_vectors = np.asarray(encode_fn(missing), dtype=np.float32)
+            self.put_many(missing, new_vectors)
+            found.update(zip(missing, new_vectors))
+
+        return np.array([found[text] for text in texts], dtype=np.float32)
+
+
+embedding_cache = EmbeddingCache(backend_cache_name(EMBEDDING_MODEL_NAME))
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 def embed_chunks(chunks):
     """
     Takes a list of text chunks and returns their vector embeddings.
     """
-    embeddings = model.encode(chunks, show_progress_bar=False)
-    return np.array(embeddings)
+    if not chunks:
+        return np.zeros((0, get_embedding_model().dimension), dtype=np.float32)
+    return embedding_cache.embed(chunks, get_embedding_service().encode)
+
+def embed_queries(queries):
+    """
+    Encodes ad-hoc queries (not cached). Requests from all sessions are
+    micro-batched together by the embedding service.
+    """
+    return get_embedding_service().encode(queries)
 
 def build_faiss_index(chunks):
     """
@@ -21,19 +184,77 @@ def build_faiss_index(chunks):
     index.add(embeddings)
     return index, embeddings
 
+def _ids_to_chunks(ids, chunks):
+    # FAISS pads the result with -1 when fewer than k vectors exist; chunks[-1]
+    # would silently repeat the last chunk
+    return [chunks[i] for i in ids if 0 <= i < len(chunks)]
+
 def search_index(query, index, chunks, top_k=3):
     """
     Search FAISS index with a query and return top-k matching chunks.
     """
-    query_embedding = model.encode([query])
-    _, I = index.search(np.array(query_embedding), top_k)
-    return [chunks[i] for i in I[0]]
+    return get_top_k_chunks(index, chunks, query, k=top_k)
 
 def get_top_k_chunks(index, chunks, query, k=3):
     """
     Given a FAISS index and list of chunks, return top-k relevant chunks for a query.
     """
-    query_embedding = model.encode([query])
+    k = min(k, index.ntotal)
+    if k <= 0:
+        return []
+    query_embedding = embed_queries([query])
     _, indices = index.search(query_embedding, k)
-    return [chunks[i] for i in indices[0] if i < len(chunks)]
+    return _ids_to_chunks(indices[0], chunks)
+
+def get_top_k_chunks_batch(index, chunks, queries, k=3):
+    """
+    Batched get_top_k_chunks: one encode call and one multi-row FAISS search
+    for all queries. Returns one list of chunks per query, in query order.
+    """
+    k = min(k, index.ntotal)
+    if not queries or k <= 0:
+        return [[] for _ in queries]
+    query_embeddings = embed_queries(queries)
+    _, indices = index.search(query_embeddings, k)
+    return [_ids_to_chunks(row, chunks) for row in indices]
+
 
+# === Reusable retrieval index ===
+class RetrievalIndex:
+    """
+    A FAISS index built once over a fixed list of chunks and reused for every query.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.index, self.embeddings = build_faiss_index(self.chunks)
+
+    def search(self, query, top_k=3):
+        return get_top_k_chunks(self.index, self.chunks, query, k=top_k)
+
+    def search_batch(self, queries, top_k=3):
+        return get_top_k_chunks_batch(self.index, self.chunks, queries, k=top_k)
+
+    def context(self, query, token_budget, candidates=8):
+        """
+        Returns the best non-overlapping chunks for query, packed into token_budget.
+        """
+        return assemble_context(self.search(query, top_k=candidates), token_budget)
+
+
+_retrieval_indexes = LRUCache(max_entries=64)
+
+
+def get_retrieval_index(chunks):
+    """
+    Returns the RetrievalIndex for these chunks, building it only the first time.
+
+    Indexes are cached by a hash of the chunk contents, so they are rebuilt
+    only when the underlying resume / JD text actually changes.
+    """
+    key = hash_payload(chunks)
+    retrieval_index = _retrieval_indexes.get(key)
+    if retrieval_index is None:
+        retrieval_index = RetrievalIndex(chunks)
+        _retrieval_indexes.put(key, retrieval_index)
+    return retrieval_index
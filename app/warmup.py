@@ -0,0 +1,38 @@
+import os
+import threading
+import time
+
+_started = False
+_lock = threading.Lock()
+warm_up_timings = {}
+
+
+def _warm_up():
+    from skill_matcher import get_skill_matcher
+    from job_parser import get_nlp
+    from vector_store import get_embedding_model
+
+    for name, loader in [("skill_matcher", get_skill_matcher), ("spacy", get_nlp),
+                         ("embedding_model", get_embedding_model)]:
+        start = time.perf_counter()
+        try:
+            loader()
+        except Exception as e:  # warm-up is best effort; first real use will retry
+            print(f"⚠️ Warm-up of {name} failed: {e}")
+            continue
+        warm_up_timings[name] = time.perf_counter() - start
+
+
+def start_background_warm_up():
+    """
+    Loads the heavy shared models on a daemon thread, once per process.
+    Disabled with WARM_UP_MODELS=0.
+    """
+    global _started
+    if os.environ.get("WARM_UP_MODELS", "1") != "1":
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_warm_up, name="model-warm-up", daemon=True).start()
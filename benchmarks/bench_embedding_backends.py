@@ -0,0 +1,150 @@
+"""
+Compares the PyTorch and int8 ONNX embedding backends.
+
+Accuracy: both backends embed the same synthetic resume/JD corpus and
+queries; the script reports per-text cosine agreement and how often both
+backends retrieve the same documents, and exits non-zero if the quantized
+rankings drift past the thresholds.
+
+Performance: each backend runs in a fresh interpreter (so RSS is not
+shared) and reports load time, batch throughput, single-query latency and
+peak RSS.
+
+Usage:
+    python benchmarks/bench_embedding_backends.py [--docs 2000] [--queries 200] [--threads 4]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(ROOT, "app")
+
+PROBE = r"""
+import json, os, resource, sys, time
+import numpy as np
+sys.path.insert(0, {app_dir!r})
+os.chdir({root!r})
+import embedding_backends
+
+with open({corpus_path!r}, "r", encoding="utf-8") as f:
+    corpus = json.load(f)
+
+start = time.perf_counter()
+backend = embedding_backends.get_embedding_backend("all-MiniLM-L6-v2")
+load_s = time.perf_counter() - start
+
+backend.encode(corpus["docs"][:32])  # warm-up batch
+start = time.perf_counter()
+docs = backend.encode(corpus["docs"])
+batch_s = time.perf_counter() - start
+
+latencies, queries = [], []
+for query in corpus["queries"]:
+    start = time.perf_counter()
+    queries.append(backend.encode([query])[0])
+    latencies.append((time.perf_counter() - start) * 1000)
+latencies.sort()
+
+np.save({output_prefix!r} + "docs.npy", docs)
+np.save({output_prefix!r} + "queries.npy", np.array(queries))
+print(json.dumps({{
+    "load_s": load_s,
+    "docs_per_s": len(corpus["docs"]) / batch_s,
+    "query_p50_ms": latencies[len(latencies) // 2],
+    "query_p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "torch_loaded": "torch" in sys.modules
+}}))
+"""
+
+TEMPLATES = [
+    "Built {a} services with {b} and deployed them on {c}.",
+    "Led a team migrating legacy {a} code to {b}, cutting costs by {n}%.",
+    "Experience: {n} years of {a}, {b} and {c} in production.",
+    "We are hiring an engineer with strong {a} skills; {b} is a plus.",
+    "Requirements: {a}, {b}, familiarity with {c}.",
+    "Designed dashboards in {a} backed by {b} pipelines processing {n}M events a day.",
+]
+QUERY_TEMPLATES = [
+    "How much {a} experience does this candidate have?",
+    "Which roles need {a} and {b}?",
+    "Has the applicant worked with {a}?",
+]
+
+
+def build_corpus(n_docs, n_queries):
+    with open(os.path.join(ROOT, "data", "skills_taxonomy.json"), "r", encoding="utf-8") as f:
+        skills = list(json.load(f))
+    rng = random.Random(0)
+
+    def fill(template):
+        a, b, c = rng.sample(skills, 3)
+        return template.format(a=a, b=b, c=c, n=rng.randint(2, 90))
+
+    docs = [fill(rng.choice(TEMPLATES)) for _ in range(n_docs)]
+    # A few long documents exercise truncation and padding
+    docs += [" ".join(fill(rng.choice(TEMPLATES)) for _ in range(30)) for _ in range(n_docs // 50)]
+    return {"docs": docs, "queries": [fill(rng.choice(QUERY_TEMPLATES)) for _ in range(n_queries)]}
+
+
+def run_backend(backend, corpus_path, output_prefix, threads):
+    env = dict(os.environ, EMBEDDING_BACKEND=backend, EMBEDDING_THREADS=str(threads))
+    probe = PROBE.format(app_dir=APP_DIR, root=ROOT, corpus_path=corpus_path, output_prefix=output_prefix)
+    result = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"{backend} backend failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-top1", type=float, default=0.95, help="required top-1 retrieval agreement")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="required mean cosine between backends")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, "corpus.json")
+        with open(corpus_path, "w", encoding="utf-8") as f:
+            json.dump(build_corpus(args.docs, args.queries), f)
+
+        stats, vectors = {}, {}
+        for backend in ("torch", "onnx"):
+            prefix = os.path.join(directory, backend + "_")
+            stats[backend] = run_backend(backend, corpus_path, prefix, args.threads)
+            vectors[backend] = (np.load(prefix + "docs.npy"), np.load(prefix + "queries.npy"))
+
+    print(f"{'backend':<8} {'load s':>7} {'docs/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'RSS MB':>7}  torch loaded")
+    for backend, s in stats.items():
+        print(f"{backend:<8} {s['load_s']:7.2f} {s['docs_per_s']:8.1f} {s['query_p50_ms']:7.2f} "
+              f"{s['query_p95_ms']:7.2f} {s['max_rss_mb']:7.0f}  {s['torch_loaded']}")
+
+    (torch_docs, torch_queries), (onnx_docs, onnx_queries) = vectors["torch"], vectors["onnx"]
+    cosine = np.concatenate([(torch_docs * onnx_docs).sum(axis=1), (torch_queries * onnx_queries).sum(axis=1)])
+
+    k = args.top_k
+    torch_top = np.argsort(-(torch_queries @ torch_docs.T), axis=1)[:, :k]
+    onnx_top = np.argsort(-(onnx_queries @ onnx_docs.T), axis=1)[:, :k]
+    top1 = float(np.mean(torch_top[:, 0] == onnx_top[:, 0]))
+    overlap = float(np.mean([len(set(t) & set(o)) / k for t, o in zip(torch_top, onnx_top)]))
+
+    print(f"\ncosine(torch, onnx): mean {cosine.mean():.4f}  min {cosine.min():.4f}")
+    print(f"retrieval agreement: top-1 {top1:.3f}  overlap@{k} {overlap:.3f}")
+
+    ok = top1 >= args.min_top1 and cosine.mean() >= args.min_cosine
+    print("✅ ONNX rankings match PyTorch" if ok else "❌ ONNX rankings drift past the thresholds")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
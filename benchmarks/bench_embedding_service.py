@@ -0,0 +1,100 @@
+"""
+Synthetic concurrent load test for the micro-batching embedding service.
+
+Simulated sessions each send single-query encodes. Runs them once calling
+the encoder directly (one forward pass per query) and once through
+EmbeddingService, and reports throughput and p50/p95 latency for both.
+
+By default the encoder is a cost model of a CPU forward pass: fixed
+per-call overhead plus per-text cost, with one pass running at a time as
+on a saturated host. --real uses the configured embedding backend instead.
+
+Usage:
+    python benchmarks/bench_embedding_service.py [--sessions 32] [--requests 50] [--real]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import numpy as np  # noqa: E402
+from embedding_service import EmbeddingService  # noqa: E402
+
+
+def cost_model_encoder(call_ms, text_ms, dim=384):
+    cores = threading.Lock()
+
+    def encode(texts):
+        with cores:
+            time.sleep((call_ms + text_ms * len(texts)) / 1000)
+        return np.zeros((len(texts), dim), dtype=np.float32)
+    return encode
+
+
+def run_load(encode, sessions, requests_per_session):
+    latencies, lock = [], threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session(session_id):
+        barrier.wait()
+        for i in range(requests_per_session):
+            start = time.perf_counter()
+            encode([f"session {session_id} question {i} about kubernetes"])
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=session, args=(s,)) for s in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "queries_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="encodes per session")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--call-ms", type=float, default=8, help="cost model: fixed cost per forward pass")
+    parser.add_argument("--text-ms", type=float, default=0.4, help="cost model: extra cost per text")
+    parser.add_argument("--real", action="store_true", help="use the configured embedding backend")
+    args = parser.parse_args()
+
+    if args.real:
+        from vector_store import get_embedding_model
+        encode = get_embedding_model().encode
+        encode(["warm-up"])
+    else:
+        encode = cost_model_encoder(args.call_ms, args.text_ms)
+
+    service = EmbeddingService(encode, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    results = {
+        "direct": run_load(encode, args.sessions, args.requests),
+        "micro-batched": run_load(service.encode, args.sessions, args.requests)
+    }
+
+    print(f"{args.sessions} sessions x {args.requests} single-query encodes "
+          f"({'real backend' if args.real else 'cost model'})")
+    for name, r in results.items():
+        print(f"{name:<14} {r['queries_per_second']:8.1f} q/s   p50 {r['p50_ms']:7.1f} ms   p95 {r['p95_ms']:7.1f} ms")
+
+    stats = service.stats()
+    print(f"service: {stats['batches']} batches, mean batch {stats['mean_batch_size']:.1f}, "
+          f"{stats['texts_per_second']:.1f} texts/s, p95 {stats['p95_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares the single-pass PyMuPDF extraction engine against the previous
+two-library path (PyPDF2 for text + PyMuPDF for links).
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py [PDF_PATH] [--runs N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import fitz  # noqa: E402
+import PyPDF2  # noqa: E402
+from resume_parser import extract_resume  # noqa: E402
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "data", "sample_resumes", "RUCHIR_ADNAIK_CV (2).pdf")
+
+
+def legacy_extract(pdf_path):
+    """
+    The original behaviour: open with PyPDF2 for text, then again with fitz for links.
+    """
+    text = ""
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            text += page.extract_text() or ""
+    text = text.replace('\n', ' ').replace('\r', '').strip()
+
+    links = []
+    doc = fitz.open(pdf_path)
+    for page in doc:
+        for link in page.get_links():
+            uri = link.get("uri", None)
+            if uri:
+                links.append(uri)
+
+    return {"text": text, "links": links}
+
+
+def measure(fn, pdf_path, runs):
+    fn(pdf_path)  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(pdf_path)
+    mean_ms = (time.perf_counter() - start) / runs * 1000
+
+    tracemalloc.start()
+    fn(pdf_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return mean_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", nargs="?", default=DEFAULT_PDF)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"PDF: {args.pdf} ({args.runs} runs)")
+    print(f"{'path':<22}{'mean ms':>10}{'py peak KiB':>14}")
+    for name, fn in [("legacy (PyPDF2+fitz)", legacy_extract), ("single-pass (fitz)", extract_resume)]:
+        mean_ms, peak_kib = measure(fn, args.pdf, args.runs)
+        print(f"{name:<22}{mean_ms:>10.2f}{peak_kib:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Skill-extraction throughput as the taxonomy grows from 20 to 20,000 terms.
+
+Compares the compiled trie-regex SkillMatcher against the previous approach
+of one re.search per skill.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--sizes 20 200 2000 20000]
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from skill_matcher import SkillMatcher  # noqa: E402
+
+SAMPLE_TEXT = (
+    "Data scientist with 4 years of experience in Python, SQL and machine learning. "
+    "Built NLP pipelines with spaCy and PyTorch, deployed models on AWS with Docker and k8s. "
+    "Created Power BI and Tableau dashboards for stakeholders; strong communication and leadership. "
+)
+
+
+def synthetic_taxonomy(size, seed=0):
+    rng = random.Random(seed)
+    taxonomy = {}
+    while len(taxonomy) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+                 for _ in range(rng.randint(1, 3))]
+        taxonomy[" ".join(words)] = [words[0][:3] + str(rng.randint(0, 99))] if rng.random() < 0.3 else []
+    # Keep a few real skills so matches actually happen
+    taxonomy.update({"python": [], "sql": [], "machine learning": ["ml"], "kubernetes": ["k8s"]})
+    return taxonomy
+
+
+def legacy_extract(terms, text):
+    return [t for t in terms if re.search(rf"\b{re.escape(t)}\b", text, re.IGNORECASE)]
+
+
+def throughput(fn, text, min_seconds=0.5):
+    runs, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn(text)
+        runs += 1
+    elapsed = time.perf_counter() - start
+    return runs * len(text) / elapsed / 1e6, elapsed / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=50, help="copies of the sample text per document")
+    parser.add_argument("--legacy-max", type=int, default=2000, help="skip the per-skill loop above this size")
+    args = parser.parse_args()
+
+    text = SAMPLE_TEXT * args.repeat
+    print(f"document: {len(text) / 1024:.0f} KiB")
+    print(f"{'terms':>7}{'build ms':>10}{'matcher MB/s':>14}{'ms/doc':>9}{'legacy MB/s':>13}{'ms/doc':>9}")
+
+    for size in args.sizes:
+        taxonomy = synthetic_taxonomy(size)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        mbps, ms_doc = throughput(matcher.extract, text)
+        row = f"{size:>7}{build_ms:>10.1f}{mbps:>14.2f}{ms_doc:>9.2f}"
+
+        if size <= args.legacy_max:
+            terms = [t for name, aliases in taxonomy.items() for t in [name, *aliases]]
+            legacy_mbps, legacy_ms = throughput(lambda doc: legacy_extract(terms, doc), text)
+            row += f"{legacy_mbps:>13.2f}{legacy_ms:>9.2f}"
+        else:
+            row += f"{'skipped':>13}{'':>9}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
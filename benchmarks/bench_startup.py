@@ -0,0 +1,67 @@
+"""
+Cold-start benchmark: time to first render of app/main.py and resident memory.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+"First render" is one full script run through Streamlit's AppTest harness
+with no upload, i.e. what a new visitor sees before touching anything.
+Background warm-up is disabled so the numbers reflect the request path.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(ROOT, "app")
+
+PROBE = r"""
+import json, os, resource, sys, time
+sys.path.insert(0, {app_dir!r})
+os.chdir({app_dir!r})
+
+start = time.perf_counter()
+import resume_parser, job_parser, chatbot, scoring, report_exporter  # noqa: F401
+import_seconds = time.perf_counter() - start
+
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+AppTest.from_file("main.py", default_timeout=120).run()
+render_seconds = time.perf_counter() - start
+
+heavy = [m for m in ("sentence_transformers", "torch", "spacy") if m in sys.modules]
+print(json.dumps({{
+    "import_s": import_seconds,
+    "first_render_s": render_seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules_loaded": heavy,
+}}))
+"""
+
+
+def run_probe():
+    env = dict(os.environ, WARM_UP_MODELS="0")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(app_dir=APP_DIR)],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'run':>4}{'imports s':>11}{'first render s':>16}{'max RSS MB':>12}  heavy modules loaded")
+    for run in range(1, args.runs + 1):
+        result = run_probe()
+        print(f"{run:>4}{result['import_s']:>11.2f}{result['first_render_s']:>16.2f}"
+              f"{result['max_rss_mb']:>12.0f}  {', '.join(result['heavy_modules_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Local stand-in for an OpenAI-compatible /v1/chat/completions endpoint.
+
+Point the app (or ChatClient) at it to exercise pooling, timeouts and
+retries without touching the real provider:
+
+    python benchmarks/stub_llm_server.py --port 8765 --fail-first 2
+    GROQ_API_URL=http://127.0.0.1:8765/v1/chat/completions streamlit run app/main.py
+
+Every reply echoes the last user message; requests with "stream": true get
+the reply as server-sent events, one word per chunk. --fail-first N answers the first
+N requests with 429 + Retry-After, --error-rate returns random 503s and
+--delay adds server-side latency (--token-delay between streamed chunks).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    def __init__(self, fail_first=0, error_rate=0.0, delay=0.0, retry_after=0, token_delay=0.0):
+        self.fail_first = fail_first
+        self.error_rate = error_rate
+        self.delay = delay
+        self.retry_after = retry_after
+        self.token_delay = token_delay
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    class ChatCompletionsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body, headers=None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def _send_stream(self, content, model):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            for position, word in enumerate(content.split(" ")):
+                delta = word if position == 0 else " " + word
+                event = {
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]
+                }
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                time.sleep(state.token_delay)
+
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+
+            with state.lock:
+                state.requests += 1
+                request_no = state.requests
+
+            if request_no <= state.fail_first:
+                self._send_json(429, {"error": {"message": "rate limited"}},
+                                {"Retry-After": str(state.retry_after)})
+                return
+            if random.random() < state.error_rate:
+                self._send_json(503, {"error": {"message": "unavailable"}})
+                return
+
+            time.sleep(state.delay)
+            user_messages = [m["content"] for m in payload.get("messages", []) if m.get("role") == "user"]
+            content = f"stub reply to: {user_messages[-1] if user_messages else ''}"
+
+            if payload.get("stream"):
+                self._send_stream(content, payload.get("model"))
+                return
+
+            self._send_json(200, {
+                "id": f"stub-{request_no}",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            })
+
+    return ChatCompletionsHandler
+
+
+def start_stub_server(port=0, **options):
+    """
+    Starts the stub on a background thread. Returns (server, base_url, state).
+    """
+    state = StubState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    return server, url, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=0)
+    args = parser.parse_args()
+
+    server, url, _ = start_stub_server(args.port, fail_first=args.fail_first, error_rate=args.error_rate,
+                                       delay=args.delay, retry_after=args.retry_after,
+                                       token_delay=args.token_delay)
+    print(f"Stub chat completions endpoint listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The app modules use bare imports (streamlit runs app/main.py as a script)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+# The stub LLM server lives with the benchmarks that also drive it
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+MAIN = os.path.join(os.path.dirname(__file__), "..", "app", "main.py")
+
+
+@pytest.fixture
+def saved_session_id(tmp_path, monkeypatch):
+    import chat_store
+
+    monkeypatch.chdir(tmp_path)  # the app's stores live under relative paths
+    monkeypatch.setenv("WARM_UP_MODELS", "0")
+    monkeypatch.setattr(chat_store, "_store", None)
+
+    return chat_store.get_chat_store().save_session("saved chat", [
+        {"role": "system", "content": "You are a helpful AI career coach."},
+        {"role": "user", "content": "hello from saved", "time": "10:00"},
+        {"role": "assistant", "content": "hi saved", "time": "10:01"}
+    ])
+
+
+@pytest.fixture
+def app(saved_session_id):
+    return AppTest.from_file(MAIN, default_timeout=60).run()
+
+
+def chat_chooser(at):
+    return next(s for s in at.selectbox if s.label == "Choose a chat")
+
+
+def clear_button(at):
+    return next(b for b in at.button if b.label == "🧹 Clear Chat")
+
+
+def visible_history(at):
+    return [m["content"] for m in at.session_state.chat_history if m["role"] != "system"]
+
+
+def test_load_then_clear_saved_chat(app, saved_session_id):
+    assert not app.exception
+
+    chat_chooser(app).set_value(saved_session_id).run()
+    assert visible_history(app) == ["hello from saved", "hi saved"]
+
+    clear_button(app).click().run()
+    assert visible_history(app) == []
+    assert chat_chooser(app).value is None
+    assert app.session_state.chat_session_id is None
+
+    # Plain reruns don't bring it back; selecting it again does
+    app.run()
+    assert visible_history(app) == []
+    chat_chooser(app).set_value(saved_session_id).run()
+    assert visible_history(app) == ["hello from saved", "hi saved"]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from chat_store import ChatSessionStore
+
+
+def make_messages(count):
+    return [
+        {"role": "user" if seq % 2 else "assistant", "content": f"message {seq}", "time": f"10:{seq % 60:02d}"}
+        for seq in range(count)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChatSessionStore(path=str(tmp_path / "sessions.sqlite"), legacy_dir=None)
+
+
+def test_load_messages_pages_back_to_the_start(store):
+    messages = make_messages(120)
+    session_id = store.save_session("long chat", messages)
+
+    page, first_seq = store.load_messages(session_id, limit=50)
+    assert page == messages[70:]
+    assert first_seq == 70
+
+    page, first_seq = store.load_messages(session_id, limit=50, before_seq=first_seq)
+    assert page == messages[20:70]
+    assert first_seq == 20
+
+    page, first_seq = store.load_messages(session_id, limit=50, before_seq=first_seq)
+    assert page == messages[:20]
+    assert first_seq == 0
+
+
+def test_appended_messages_continue_the_sequence(store):
+    session_id = store.save_session("chat", make_messages(3))
+    store.append_message(session_id, {"role": "user", "content": "appended"})
+
+    page, first_seq = store.load_messages(session_id, limit=2)
+    assert page == [make_messages(3)[2], {"role": "user", "content": "appended", "time": None}]
+    assert first_seq == 2
+    assert store.list_sessions()[0]["message_count"] == 4
+
+
+def test_saving_an_existing_title_replaces_its_history(store):
+    session_id = store.save_session("chat", make_messages(5))
+    assert store.save_session("chat", make_messages(2)) == session_id
+    assert store.load_messages(session_id) == (make_messages(2), 0)
+    assert store.count_sessions() == 1
+
+
+def test_list_sessions_pages_most_recent_first(store):
+    for index in range(5):
+        store.save_session(f"chat {index}", make_messages(index + 1))
+    store.append_message(store.find_session("chat 1"), {"role": "user", "content": "bump"})
+
+    first_page = store.list_sessions(limit=3)
+    second_page = store.list_sessions(limit=3, offset=3)
+    assert [s["title"] for s in first_page] == ["chat 1", "chat 4", "chat 3"]
+    assert [s["title"] for s in second_page] == ["chat 2", "chat 0"]
+    assert first_page[0]["message_count"] == 3
+    assert store.count_sessions() == 5
+
+
+def test_legacy_json_sessions_round_trip(tmp_path):
+    legacy_dir = tmp_path / "chat_sessions"
+    legacy_dir.mkdir()
+    sessions = {"first chat": make_messages(3), "second chat": make_messages(60)}
+    for title, messages in sessions.items():
+        (legacy_dir / f"{title}.json").write_text(json.dumps(messages), encoding="utf-8")
+    (legacy_dir / "broken.json").write_text("{not json", encoding="utf-8")
+    db_path = str(legacy_dir / "sessions.sqlite")
+
+    store = ChatSessionStore(path=db_path, legacy_dir=str(legacy_dir))
+    assert store.count_sessions() == 2
+    for title, messages in sessions.items():
+        assert store.load_messages(store.find_session(title), limit=100) == (messages, 0)
+
+    # Reopening must not import the files again or overwrite newer turns
+    store.append_message(store.find_session("first chat"), {"role": "user", "content": "after import"})
+    reopened = ChatSessionStore(path=db_path, legacy_dir=str(legacy_dir))
+    assert reopened.count_sessions() == 2
+    messages, _ = reopened.load_messages(reopened.find_session("first chat"))
+    assert messages[-1]["content"] == "after import"
+    assert len(messages) == 4
@@ -0,0 +1,145 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_client import ChatClient, LLMError
+from stub_llm_server import start_stub_server
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server, url, state = start_stub_server(**options)
+        servers.append(server)
+        return url, state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def scripted():
+    """
+    Serves the given (status, content_type, body) replies in order, so tests
+    can return bodies the stub server never sends.
+    """
+    servers = []
+
+    def start(replies):
+        replies = list(replies)
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                status, content_type, body = replies.pop(0)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions", received
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_client(url, max_retries=3):
+    return ChatClient(url, "test-key", connect_timeout=2, read_timeout=5, max_retries=max_retries,
+                      backoff_base=0.01)
+
+
+def sse(*events):
+    return "".join(f"data: {event}\n\n" for event in events)
+
+
+def test_retries_rate_limited_requests(stub):
+    url, state = stub(fail_first=2)
+    assert make_client(url).chat(MESSAGES, model="stub") == "stub reply to: hello"
+    assert state.requests == 3
+
+
+def test_retries_rate_limited_stream_before_first_byte(stub):
+    url, state = stub(fail_first=1)
+    assert "".join(make_client(url).chat_stream(MESSAGES, model="stub")) == "stub reply to: hello"
+    assert state.requests == 2
+
+
+def test_gives_up_after_max_retries(stub):
+    url, state = stub(error_rate=1.0)
+    with pytest.raises(LLMError) as excinfo:
+        make_client(url, max_retries=2).chat(MESSAGES, model="stub")
+    assert excinfo.value.status_code == 503
+    assert state.requests == 3
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_retries_server_errors(scripted, status):
+    url, received = scripted([
+        (status, "application/json", '{"error": {"message": "try again"}}'),
+        (200, "application/json", json.dumps({"choices": [{"message": {"content": " ok "}}]}))
+    ])
+    assert make_client(url).chat(MESSAGES, model="stub") == "ok"
+    assert len(received) == 2
+
+
+def test_client_errors_are_not_retried(scripted):
+    url, received = scripted([(400, "application/json", '{"error": {"message": "bad request"}}')])
+    with pytest.raises(LLMError) as excinfo:
+        make_client(url).chat(MESSAGES, model="stub")
+    assert excinfo.value.status_code == 400
+    assert len(received) == 1
+
+
+@pytest.mark.parametrize("body", [
+    "not json",
+    '{"error": {"message": "quota exceeded"}}',
+    '{"choices": []}',
+    '{"choices": [{"message": null}]}',
+    '["unexpected"]'
+])
+def test_malformed_completion_raises_llm_error(scripted, body):
+    url, _ = scripted([(200, "application/json", body)])
+    with pytest.raises(LLMError, match="Malformed completion response"):
+        make_client(url).chat(MESSAGES, model="stub")
+
+
+@pytest.mark.parametrize("body", [
+    sse('{"choices": [{"delta": {"content": "partial"}}]}', "{not json"),
+    sse('["unexpected"]'),
+    sse('{"choices": [{"delta": "text"}]}'),
+    sse('{"error": {"message": "overloaded"}}')
+])
+def test_malformed_stream_raises_llm_error(scripted, body):
+    url, _ = scripted([(200, "text/event-stream", body)])
+    with pytest.raises(LLMError):
+        list(make_client(url).chat_stream(MESSAGES, model="stub"))
+
+
+def test_stream_ignores_comments_and_stops_at_done(scripted):
+    body = ": keep-alive\n\n" + sse(
+        '{"choices": [{"delta": {"role": "assistant"}}]}',
+        '{"choices": [{"delta": {"content": "café"}}]}',
+        "[DONE]",
+        '{"choices": [{"delta": {"content": "after done"}}]}'
+    )
+    url, _ = scripted([(200, "text/event-stream", body)])
+    assert list(make_client(url).chat_stream(MESSAGES, model="stub")) == ["café"]
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from llm_scheduler import LLMScheduler, RequestCancelled, PRIORITY_BACKGROUND
+
+
+def drain_requests(scheduler):
+    """
+    Uses up every request slot, so the next call has to queue.
+    """
+    scheduler.requests.consume(scheduler.requests.capacity, time.monotonic())
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def start(target, *args, **kwargs):
+    outcome = {}
+
+    def runner():
+        try:
+            outcome["result"] = target(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_identical_calls_share_one_provider_request():
+    scheduler = LLMScheduler()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    runs = [start(scheduler.run, "same-key", call) for _ in range(4)]
+    wait_until(lambda: scheduler.stats()["deduplicated"] == 3)
+    release.set()
+    for thread, outcome in runs:
+        thread.join(5)
+        assert outcome == {"result": "answer"}
+    assert len(calls) == 1
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_duplicate_stream_receives_the_full_text():
+    scheduler = LLMScheduler()
+    release = threading.Event()
+
+    def stream_call():
+        yield "hello"
+        release.wait(5)
+        yield " world"
+
+    leader = scheduler.stream("same-key", stream_call)
+    assert next(leader) == "hello"
+    follower_thread, follower = start(lambda: list(scheduler.stream("same-key", stream_call)))
+    wait_until(lambda: scheduler.stats()["deduplicated"] == 1)
+    release.set()
+    assert list(leader) == [" world"]
+    follower_thread.join(5)
+    assert follower == {"result": ["hello world"]}
+
+
+def test_failures_reach_every_duplicate():
+    scheduler = LLMScheduler()
+    release = threading.Event()
+
+    def call():
+        release.wait(5)
+        raise ValueError("provider down")
+
+    runs = [start(scheduler.run, "same-key", call) for _ in range(3)]
+    wait_until(lambda: scheduler.stats()["deduplicated"] == 2)
+    release.set()
+    for thread, outcome in runs:
+        thread.join(5)
+        assert isinstance(outcome["error"], ValueError)
+
+
+def test_cancelling_a_queued_call_frees_its_place():
+    scheduler = LLMScheduler(requests_per_minute=1)
+    drain_requests(scheduler)
+    cancel = threading.Event()
+    calls = []
+
+    thread, outcome = start(scheduler.run, "queued", lambda: calls.append(1), PRIORITY_BACKGROUND,
+                            cancel_event=cancel)
+    wait_until(lambda: scheduler.stats()["queue_depth"] == 1)
+    cancel.set()
+    thread.join(5)
+
+    assert isinstance(outcome["error"], RequestCancelled)
+    assert calls == []
+    stats = scheduler.stats()
+    assert stats["cancelled"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_duplicate_takes_over_when_the_leader_is_cancelled():
+    scheduler = LLMScheduler(requests_per_minute=60)  # one slot per second once drained
+    drain_requests(scheduler)
+    cancel = threading.Event()
+
+    leader_thread, leader = start(scheduler.run, "same-key", lambda: "from leader", cancel_event=cancel)
+    wait_until(lambda: scheduler.stats()["queue_depth"] == 1)
+    follower_thread, follower = start(scheduler.run, "same-key", lambda: "from follower")
+    wait_until(lambda: scheduler.stats()["deduplicated"] == 1)
+    cancel.set()
+
+    leader_thread.join(5)
+    follower_thread.join(5)
+    assert isinstance(leader["error"], RequestCancelled)
+    assert follower == {"result": "from follower"}
+
+
+def test_queued_calls_are_admitted_by_priority():
+    scheduler = LLMScheduler(requests_per_minute=600)  # one slot per 0.1s once drained
+    drain_requests(scheduler)
+    order = []
+
+    background = start(scheduler.run, "background", lambda: order.append("background"), PRIORITY_BACKGROUND)
+    wait_until(lambda: scheduler.stats()["queue_depth"] == 1)
+    interactive = start(scheduler.run, "interactive", lambda: order.append("interactive"))
+    for thread, _ in (background, interactive):
+        thread.join(5)
+
+    assert order == ["interactive", "background"]
+
+
+@pytest.mark.parametrize("tokens", [1, 10 ** 6])
+def test_oversized_prompts_are_still_admitted(tokens):
+    scheduler = LLMScheduler(tokens_per_minute=100)
+    assert scheduler.run("key", lambda: "ok", tokens=tokens) == "ok"
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(__file__), "..", "data", "sample_resumes", "RUCHIR_ADNAIK_CV (2).pdf")
+
+
+class _FakeIndex:
+    def search_batch(self, queries, top_k=3):
+        return [[] for _ in queries]
+
+
+@pytest.fixture
+def parsed_text():
+    resume_parser = pytest.importorskip("resume_parser")
+    with open(SAMPLE_RESUME, "rb") as f:
+        return resume_parser.extract_resume(f.read())["text"]
+
+
+@pytest.mark.parametrize("num_lines", [1, 3, 5])
+def test_rewrites_one_line_per_statement(parsed_text, monkeypatch, num_lines):
+    chatbot = pytest.importorskip("chatbot")
+    calls = []
+
+    def fake_chat(messages, **kwargs):
+        calls.append(messages)
+        return f"improved {len(calls)}"
+
+    monkeypatch.setattr(chatbot, "call_groq_chat", fake_chat)
+    monkeypatch.setattr(chatbot, "get_retrieval_index", lambda chunks: _FakeIndex())
+
+    assert "\n" not in parsed_text  # the parser flattens line breaks
+    rewrites = list(chatbot.iter_improved_resume_lines(parsed_text, num_lines=num_lines))
+
+    assert len(rewrites) == num_lines
+    assert len(calls) == num_lines
+    assert sorted(position for position, _, _ in rewrites) == list(range(num_lines))
+    originals = [original for _, original, _ in rewrites]
+    assert all(len(original) < len(parsed_text) / 2 for original in originals)
+
+
+FLATTENED_HEADER = (
+    "Jane   Q   Doe     9876543210     jane.doe@example.com     linkedin.com/in/jane-doe-1234     JANE   DOE "
+    "Summar y  Backend engineer with six years of experience building payment systems.   "
+    "Experience  Built a fraud scoring service in Go that handles 4k requests per second.  "
+    "Technic al Skills  Go, Python, PostgreSQL, Kafka and Kubernetes in production."
+)
+
+
+def test_resume_lines_skip_contact_header_and_headings():
+    utils = pytest.importorskip("utils")
+    lines = list(utils.iter_resume_lines(FLATTENED_HEADER))
+
+    assert lines == [
+        "Backend engineer with six years of experience building payment systems.",
+        "Built a fraud scoring service in Go that handles 4k requests per second.",
+        "Go, Python, PostgreSQL, Kafka and Kubernetes in production."
+    ]
+
+
+def test_sample_resume_header_is_not_a_rewrite_target(parsed_text):
+    utils = pytest.importorskip("utils")
+    first_lines = list(utils.iter_resume_lines(parsed_text))[:3]
+
+    for line in first_lines:
+        assert "@" not in line and "9172922504" not in line
+        assert not line.startswith("Ruchir")
@@ -0,0 +1,78 @@
+import pytest
+
+from skill_matcher import get_skill_matcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return get_skill_matcher()
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("pytest", ["pytest"]),
+        ("JUnit", ["junit"]),
+        ("unittest", []),
+        ("unit tests", ["unit testing"]),
+        ("torch", []),
+        ("PyTorch", ["pytorch"]),
+        ("Unix", ["unix"]),
+        ("Linux", ["linux"]),
+        ("Scrum and Kanban", ["kanban", "scrum"]),
+        ("Agile", ["agile"]),
+        ("containerization", []),
+        ("Docker", ["docker"]),
+    ],
+)
+def test_aliases_do_not_merge_distinct_skills(matcher, text, expected):
+    assert matcher.extract(text) == expected
+
+
+def test_resume_with_pytest_does_not_cover_junit(matcher):
+    resume_skills = set(matcher.extract("Wrote integration suites with pytest."))
+    jd_skills = set(matcher.extract("Experience with JUnit required."))
+    assert not resume_skills & jd_skills
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Renamed main.py and added 5 ml of buffer to every dl of sample.",
+        "Set rl = 0 before the loop; the rails were painted to stop rust.",
+        "A spark of curiosity helped us react quickly and swift delivery followed.",
+        "Worked under the leadership of the CTO on internal communication.",
+    ],
+)
+def test_ordinary_prose_matches_no_skills(matcher, text):
+    assert matcher.extract(text) == []
+
+
+def test_ambiguous_terms_match_when_written_as_skills(matcher):
+    text = "Built iOS apps in Swift and Rust services behind a React UI on Rails, with Spark jobs for ML, DL and RL."
+    assert matcher.extract(text) == [
+        "apache spark",
+        "deep learning",
+        "ios",
+        "machine learning",
+        "react",
+        "reinforcement learning",
+        "ruby on rails",
+        "rust",
+        "swift",
+    ]
+
+
+def test_soft_skills_need_a_qualifying_phrase(matcher):
+    assert matcher.extract("Strong communication skills and team leadership.") == ["communication", "leadership"]
+    assert matcher.canonical("communication") is None
+    assert matcher.canonical("communication skills") == "communication"
+
+
+def test_canonical_applies_the_same_case_rules(matcher):
+    assert matcher.canonical("ML") == "machine learning"
+    assert matcher.canonical("ml") is None
+    assert matcher.canonical("rust") is None
+    assert matcher.canonical("Rust") == "rust"
+    assert matcher.canonical("python") == "python"
+    assert matcher.canonical("py") is None